@@ -1,3 +1,46 @@
 #TBapi - A Python Library for connection to The Blue Alliance API v2 | Created by Plasma Robotics, Team 2403
 
-from .main import *
+#Every public name is loaded from its submodule the first time it is used, so 'import TBApi' stays cheap and numpy, requests and aiohttp are only imported by the code that needs them
+
+from importlib import import_module
+
+#submodule -> names it provides
+_SUBMODULES = {
+    'models': ('TBATeam', 'TBAEvent', 'TBAEventStats', 'TBAEventStatsCategory', 'rank_column_name', 'TBAEventRankings', 'TBAEventTeamRank',
+               'TBADistrictPoints', 'TBADistrictPointsTeam', 'TBAMatch', 'TBAAward', 'TBAMedia', 'TBARobotGroup', 'TBARobot', 'TBATeamProfile'),
+    'parser': ('TBAParser', 'COMPACT_MODELS'),
+    'transport': ('TBATransport', 'TBAResponse'),
+    'cache': ('TBACache', 'TBAMemoryCache', 'TBADiskCache'),
+    'batch': ('TBABatchResult',),
+    'errors': ('TBAError',),
+    'throttle': ('TBARateLimiter', 'TBABackoff', 'TBARequestCoalescer'),
+    'compact': ('TBACompactTeam', 'TBACompactEvent', 'TBACompactMatch', 'TBACompactAward', 'TBACompactMedia', 'TBACompactRobot'),
+    'export': ('matches_to_array', 'teams_to_array', 'rankings_to_array'),
+    'district': ('TBADistrictStandings',),
+    'stats': ('TBAStatsEngine', 'calc_season_stats'),
+    'watcher': ('TBAEventWatcher', 'TBAEventUpdate'),
+    'event_index': ('TBAEventIndex',),
+    'identity': ('TBAIdentityMap',),
+    'decode': ('get_decoder',),
+    'match_index': ('TBAMatchIndex', 'parse_match_key', 'build_match_key', 'match_played'),
+    'snapshot': ('TBASnapshotStore', 'TBAReplayTransport', 'snapshot_year'),
+    'refresher': ('TBARefresher',),
+    'crawler': ('TBASeasonCrawler',),
+    'instrument': ('TBAInstrumentation', 'TBAInstrumentationGroup', 'TBAMetrics', 'endpoint_template'),
+    'async_parser': ('TBAAsyncParser',),
+}
+
+_LAZY_NAMES = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = list(_LAZY_NAMES)
+
+def __getattr__(name): #loads the submodule that provides name and caches the value on the package, so later lookups skip this function entirely
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError("module 'TBApi' has no attribute '{name}'".format(name = name))
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
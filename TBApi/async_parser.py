@@ -0,0 +1,239 @@
+#TBApi - asyncio counterpart to TBAParser.  Requires the optional aiohttp package
+
+import asyncio
+from collections import OrderedDict
+from .decode import json_loads
+from .errors import TBAError
+from .transport import TBAResponse
+from .throttle import TBABackoff
+from .models import TBATeam, TBAEvent, TBAEventStats, TBAEventRankings, TBADistrictPoints, TBAMatch, TBAAward, TBAMedia, TBARobotGroup, TBATeamProfile
+from .parser import TBAParser
+from .event_index import TBAEventIndex
+
+#asyncio version of TBAParser.  Every single key get_* method is a coroutine that returns the same objects as its TBAParser counterpart (the *_batch methods, fields, get_match_index, calc_event_stats and get_district_standings are not provided), and at most max_concurrency requests are in flight at once, so many calls can be awaited together with asyncio.gather
+class TBAAsyncParser:
+    def __init__(self, team_number, package_name, version_number, session = None, max_concurrency = 20, cache = None, timeout = 30, backoff = None): #session may be an existing aiohttp.ClientSession, which will be left open by close().  backoff may be a TBABackoff (defaults to 3 retries), and is used for throttled and failed responses as in TBAParser
+        self.team_number = team_number
+        self.package_name = package_name
+        self.version_number = version_number
+        self.header = {'X-TBA-App-Id': 'frc{team}:{package}:{version}'.format(team = team_number, package = package_name, version = version_number)}
+        self.baseURL = 'http://www.thebluealliance.com/api/v2'
+
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("[TBA-API] TBAAsyncParser requires the aiohttp package.  Install it with 'pip install aiohttp'")
+        self._aiohttp = aiohttp
+
+        self.session = session
+        self._owns_session = session is None #only close sessions that this parser created itself
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.timeout = timeout
+        self.backoff = backoff if backoff is not None else TBABackoff()
+        self._semaphore = None
+        self._event_indexes = {} #year -> TBAEventIndex
+
+    async def __get_session(self): #the session and semaphore are created on first use so that they belong to the running event loop
+        if self.session is None:
+            connector = self._aiohttp.TCPConnector(limit = self.max_concurrency)
+            self.session = self._aiohttp.ClientSession(connector = connector, timeout = self._aiohttp.ClientTimeout(total = self.timeout))
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    async def close(self): #Closes the parser's session if the parser created it
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def __fetch(self, url, headers): #backs off on throttled or failed responses without blocking the event loop.  Raises TBAError if TBA still answers with an error
+        session = await self.__get_session()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                async with session.get(url, headers = headers) as response:
+                    content = await response.read()
+            response = TBAResponse(response.status, response.headers, content)
+
+            if not self.backoff.should_retry(response, attempt):
+                break
+            await asyncio.sleep(self.backoff.delay(response, attempt)) #the semaphore is released while waiting
+            attempt += 1
+
+        if response.status_code >= 400:
+            raise TBAError(url, response.status_code, content)
+        return response
+
+    async def _pull(self, path): #Single request path used by every get_* method. Mirrors TBAParser._pull
+        url = self.baseURL + path
+
+        if self.cache is None:
+            response = await self.__fetch(url, self.header)
+            return response.content
+
+        content = self.cache.get_fresh(url)
+        if content is not None:
+            return content
+
+        response = await self.__fetch(url, self.cache.conditional_headers(url, self.header))
+        content = self.cache.update(url, response)
+        if content is None: #the stale copy was evicted while revalidating it
+            response = await self.__fetch(url, self.header)
+            content = self.cache.update(url, response)
+        return content
+
+    async def _pull_json(self, path):
+        return json_loads(await self._pull(path))
+
+    async def __pull_team_list_by_page(self, page):
+        json_list = await self._pull_json("/teams/" + str(page))
+        return [TBATeam(team) for team in json_list]
+
+    async def get_team_list(self, page = None): #get list of FRC teams' TBATeam objects, either the entire list, or by page #.  Pages are requested max_concurrency at a time until an empty page is found
+        if not page is None:
+            return await self.__pull_team_list_by_page(page)
+
+        team_list = []
+        for first_page in range(0, 100, self.max_concurrency):
+            pages = await asyncio.gather(*[self.__pull_team_list_by_page(page) for page in range(first_page, min(first_page + self.max_concurrency, 100))])
+            for partial_list in pages:
+                if not partial_list:
+                    return team_list
+                team_list.extend(partial_list)
+
+        return team_list
+
+    async def get_team(self, team_key): #get a team's TBATeam object
+        json = await self._pull_json("/team/" + team_key)
+        return TBATeam(json)
+
+    async def get_team_events(self, team_key, year = None): #Get a list of event objects that a given team has competed in
+        if not year is None:
+            json = await self._pull_json("/team/" + team_key + "/" + str(year) + "/events")
+        else:
+            json = await self._pull_json("/team/" + team_key + "/history/events")
+        return [TBAEvent(event) for event in json]
+
+    async def get_team_event_awards(self, team_key, event_key): #Get a list of all award objects that a team has won at a given event
+        json = await self._pull_json("/team/" + team_key + "/event/" + event_key + "/awards")
+        return [TBAAward(award) for award in json]
+
+    async def get_team_event_matches(self, team_key, event_key): #Get a list of all match objects that a team competed in at a given event
+        json = await self._pull_json("/team/" + team_key + "/event/" + event_key + "/matches")
+        return [TBAMatch(match) for match in json]
+
+    async def get_team_years_participated(self, team_key): #Get a list of years participated
+        return await self._pull_json("/team/" + team_key + "/years_participated")
+
+    async def __pull_team_media(self, team_key, year):
+        json = await self._pull_json("/team/" + team_key + "/" + str(year) + "/media")
+        return [TBAMedia(media) for media in json]
+
+    async def get_team_media(self, team_key, year = None): #Get a list of all media objects a team is responsible for.  Without a year, every year the team participated in is requested concurrently
+        if not year is None:
+            return await self.__pull_team_media(team_key, year)
+
+        years = await self.get_team_years_participated(team_key)
+
+        media_list = []
+        for partial_list in await asyncio.gather(*[self.__pull_team_media(team_key, check_year) for check_year in years]):
+            media_list.extend(partial_list)
+        return media_list
+
+    async def get_team_profile(self, team_key, media = True): #See TBAParser.get_team_profile
+        years = await self.get_team_years_participated(team_key)
+        media_lists = [self.__pull_team_media(team_key, check_year) for check_year in years] if media else []
+
+        results = await asyncio.gather(self.get_team(team_key), self.get_team_history_events(team_key), self.get_team_history_awards(team_key),
+                                       self.get_team_history_robots(team_key), self.get_team_history_districts(team_key), *media_lists)
+        team, events, awards, robots, districts = results[:5]
+        media_by_year = OrderedDict(zip(years, results[5:])) if media else {}
+
+        return TBATeamProfile(team, years, events, awards, robots, districts, media_by_year)
+
+    async def get_team_history_events(self, team_key): #Returns a list of all event objects a team has attended
+        return await self.get_team_events(team_key)
+
+    async def get_team_history_awards(self, team_key): #Returns a list of all award objects a team has won
+        json = await self._pull_json("/team/" + team_key + "/history/awards")
+        return [TBAAward(award) for award in json]
+
+    async def get_team_history_robots(self, team_key): #Returns a TBARobotGroup of all robots a team has made
+        json = await self._pull_json("/team/" + team_key + "/history/robots")
+        return TBARobotGroup(json)
+
+    async def get_team_history_districts(self, team_key): #gets a list of districts a team has participated in by year
+        return await self._pull_json("/team/" + team_key + "/history/districts")
+
+    calc_team_key = TBAParser.calc_team_key
+
+    async def get_event_list(self, year): #Returns a list of all event objects for a given year
+        json = await self._pull_json("/events/" + str(year))
+        return [TBAEvent(event) for event in json]
+
+    async def get_event(self, event_key): #Returns a single event object given an event key
+        json = await self._pull_json("/event/" + event_key)
+        return TBAEvent(json)
+
+    async def get_event_teams(self, event_key): #Returns a list of all team objects that attended an event
+        json = await self._pull_json("/event/" + event_key + "/teams")
+        return [TBATeam(team) for team in json]
+
+    async def get_event_matches(self, event_key): #Returns a list of all match objects in a given event
+        json = await self._pull_json("/event/" + event_key + "/matches")
+        return [TBAMatch(match) for match in json]
+
+    async def get_event_stats(self, event_key):
+        json = await self._pull_json("/event/" + event_key + "/stats")
+        return TBAEventStats(json)
+
+    async def get_event_rankings(self, event_key):
+        json = await self._pull_json("/event/" + event_key + "/rankings")
+        return TBAEventRankings(json)
+
+    async def get_event_awards(self, event_key): #Returns a list of all award objects given out at an event
+        json = await self._pull_json("/event/" + event_key + "/awards")
+        return [TBAAward(award) for award in json]
+
+    async def get_event_district_points(self, event_key): #returns a TBADistrictPoints obj, capable of method chaining
+        json = await self._pull_json("/event/" + event_key + "/district_points")
+        return TBADistrictPoints(json)
+
+    async def get_event_index(self, year, refresh = False): #See TBAParser.get_event_index
+        year = str(year)
+        if year not in self._event_indexes or refresh:
+            self._event_indexes[year] = TBAEventIndex(await self._pull_json("/events/" + year))
+        return self._event_indexes[year]
+
+    async def calc_event_key(self, year, name): #See TBAParser.calc_event_key
+        return (await self.get_event_index(year)).calc_event_key(name)
+
+    async def find_event_keys(self, year, name): #See TBAParser.find_event_keys
+        return (await self.get_event_index(year)).find(name)
+
+    async def calc_event_keys(self, year, names): #See TBAParser.calc_event_keys
+        return (await self.get_event_index(year)).find_many(names)
+
+    async def get_match(self, match_key): #Returns a single match object given the match key
+        json = await self._pull_json("/match/" + match_key)
+        return TBAMatch(json)
+
+    calc_match_key = TBAParser.calc_match_key
+
+    async def get_district_list(self, year):
+        return await self._pull_json("/districts/" + str(year))
+
+    async def get_district_events(self, district_key, year): #Returns a list of event objects in a specific district
+        json = await self._pull_json("/district/" + district_key + "/" + str(year) + "/events")
+        return [TBAEvent(event) for event in json]
+
+    async def get_district_teams(self, district_key, year): #Returns a list of team objects in a specific district
+        json = await self._pull_json("/district/" + district_key + "/" + str(year) + "/teams")
+        return [TBATeam(team) for team in json]
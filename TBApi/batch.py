@@ -0,0 +1,37 @@
+#TBApi - fan-out helpers used by TBAParser's *_batch methods
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+#Class returned by the batch methods of TBAParser.  Maps every key, in the order it was first given, to its result.  Keys whose request failed map to None, and the exception raised for them is kept in errors
+class TBABatchResult(OrderedDict):
+    def __init__(self):
+        OrderedDict.__init__(self)
+        self.errors = OrderedDict()
+
+    @property
+    def ok(self): #True if every key succeeded
+        return not self.errors
+
+    def succeeded(self): #returns an OrderedDict of only the keys that succeeded
+        return OrderedDict((key, value) for key, value in self.items() if key not in self.errors)
+
+#Calls method once for every distinct key on a pool of workers threads and collects the results into a TBABatchResult
+def run_batch(method, keys, workers):
+    unique_keys = list(OrderedDict.fromkeys(keys)) #repeated keys are only requested once
+    result = TBABatchResult()
+
+    if not unique_keys:
+        return result
+
+    with ThreadPoolExecutor(max_workers = max(1, min(workers, len(unique_keys)))) as executor:
+        futures = [(key, executor.submit(method, key)) for key in unique_keys]
+
+        for key, future in futures:
+            try:
+                result[key] = future.result()
+            except Exception as error:
+                result[key] = None
+                result.errors[key] = error
+
+    return result
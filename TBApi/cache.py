@@ -0,0 +1,261 @@
+#TBApi - HTTP response caches that sit under TBAParser and revalidate with TBA using Last-Modified / If-Modified-Since
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+#Class that holds a single cached response body along with what is needed to decide if it is fresh and to revalidate it
+class TBACacheEntry:
+    def __init__(self, content, last_modified, fresh_until, stored_at):
+        self.content = content #raw response body (bytes)
+        self.last_modified = last_modified #Last-Modified header sent by TBA, or None
+        self.fresh_until = fresh_until #wall clock time at which the entry must be revalidated
+        self.stored_at = stored_at #wall clock time the body was downloaded.  Used for ttl eviction
+
+    def to_meta(self): #metadata written alongside the body by TBADiskCache
+        return {'last_modified': self.last_modified, 'fresh_until': self.fresh_until, 'stored_at': self.stored_at}
+
+#Parses the max-age out of a Cache-Control header. Returns None if the response can not be stored at all
+def parse_max_age(cache_control, default_max_age = 0):
+    if not cache_control:
+        return default_max_age
+
+    max_age = default_max_age
+    for directive in cache_control.lower().split(','):
+        directive = directive.strip()
+        if directive == 'no-store':
+            return None
+        elif directive == 'no-cache':
+            max_age = 0
+        elif directive.startswith('max-age='):
+            try:
+                max_age = int(directive[8:].strip('"'))
+            except ValueError:
+                pass
+    return max_age
+
+#Base class for all TBApi caches.  Subclasses only need to provide storage (_load, _save, _delete, clear, __len__); freshness, revalidation and the hit/miss/revalidation counters live here
+class TBACache:
+    def __init__(self, ttl = None, default_max_age = 0):
+        self.ttl = ttl #hard limit in seconds on how long a body is kept, even if TBA keeps answering 304.  None keeps entries until they are evicted for size
+        self.default_max_age = default_max_age #freshness used when TBA does not send a max-age
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry.stored_at >= self.ttl
+
+    def _lookup(self, url): #returns the stored entry for a url, dropping it if it has outlived the ttl
+        entry = self._load(url)
+        if entry is not None and self._expired(entry, time.time()):
+            self._delete(url)
+            self.evictions += 1
+            entry = None
+        return entry
+
+    def get_fresh(self, url): #returns the cached body if it can be used without contacting TBA, otherwise None
+        with self._lock:
+            entry = self._lookup(url)
+            if entry is not None and time.time() < entry.fresh_until:
+                self.hits += 1
+                return entry.content
+            self.misses += 1
+            return None
+
+    def conditional_headers(self, url, headers): #adds If-Modified-Since to a copy of headers when a stale body is available for revalidation
+        with self._lock:
+            entry = self._lookup(url)
+        if entry is None or entry.last_modified is None:
+            return headers
+        conditional = dict(headers)
+        conditional['If-Modified-Since'] = entry.last_modified
+        return conditional
+
+    def update(self, url, response): #stores a fresh 200 response, or refreshes the stored entry on a 304, and returns the body that should be used.  Returns None for a 304 whose entry has been evicted in the meantime, in which case the request must be made again unconditionally
+        now = time.time()
+        max_age = parse_max_age(response.headers.get('Cache-Control'), self.default_max_age)
+
+        with self._lock:
+            if response.status_code == 304:
+                entry = self._lookup(url)
+                if entry is not None:
+                    self.revalidations += 1
+                    entry.fresh_until = now + (max_age or 0)
+                    entry.last_modified = response.headers.get('Last-Modified', entry.last_modified)
+                    self._save(url, entry)
+                    return entry.content
+                return None
+
+            if response.status_code == 200 and max_age is not None:
+                entry = TBACacheEntry(response.content, response.headers.get('Last-Modified'), now + max_age, now)
+                self._save(url, entry)
+
+        return response.content
+
+    def stats(self): #returns the cache counters as a dictionary
+        return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations, 'evictions': self.evictions, 'entries': len(self)}
+
+#In-memory least-recently-used cache.  Evicts the oldest entries once max_entries or max_bytes is exceeded
+class TBAMemoryCache(TBACache):
+    def __init__(self, max_entries = 512, max_bytes = None, ttl = None, default_max_age = 0):
+        TBACache.__init__(self, ttl, default_max_age)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+
+    def _load(self, url):
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def _save(self, url, entry):
+        old_entry = self._entries.pop(url, None)
+        if old_entry is not None:
+            self.size_bytes -= len(old_entry.content)
+        self._entries[url] = entry
+        self.size_bytes += len(entry.content)
+
+        while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                                 (self.max_bytes is not None and self.size_bytes > self.max_bytes)):
+            evicted_url, evicted = self._entries.popitem(last = False)
+            self.size_bytes -= len(evicted.content)
+            self.evictions += 1
+
+    def _delete(self, url):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.size_bytes -= len(entry.content)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+#On-disk cache that keeps one body file and one metadata file per url in directory, so cached responses survive between runs.  Evicts the least recently used files once max_entries or max_bytes is exceeded
+#The entry count and body bytes are tracked in memory, so the directory is only scanned when the cache is opened and when a limit is exceeded.  Each scan resets the totals, which corrects any drift from other processes writing to the same directory
+class TBADiskCache(TBACache):
+    def __init__(self, directory, max_entries = 4096, max_bytes = None, ttl = None, default_max_age = 0):
+        TBACache.__init__(self, ttl, default_max_age)
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        entries = self.__entries()
+        self._count = len(entries) #stored entries
+        self._bytes = sum(entry[1] for entry in entries) #total size of the stored bodies
+
+    def __path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def _load(self, url):
+        path = self.__path(url)
+        try:
+            with open(path + '.meta', 'r') as meta_file:
+                meta = json.load(meta_file)
+            with open(path + '.body', 'rb') as body_file:
+                content = body_file.read()
+        except (IOError, OSError, ValueError):
+            return None
+
+        os.utime(path + '.meta', None) #marks the entry as recently used for eviction
+        return TBACacheEntry(content, meta['last_modified'], meta['fresh_until'], meta['stored_at'])
+
+    def __body_size(self, path): #size of a stored body, or None if there is none
+        try:
+            return os.path.getsize(path + '.body')
+        except OSError:
+            return None
+
+    def _save(self, url, entry):
+        path = self.__path(url)
+        old_size = self.__body_size(path)
+        with open(path + '.body.tmp', 'wb') as body_file:
+            body_file.write(entry.content)
+        with open(path + '.meta.tmp', 'w') as meta_file:
+            json.dump(entry.to_meta(), meta_file)
+        os.replace(path + '.body.tmp', path + '.body') #write then rename so a crash never leaves a half-written entry behind
+        os.replace(path + '.meta.tmp', path + '.meta')
+
+        if old_size is None:
+            self._count += 1
+        else:
+            self._bytes -= old_size
+        self._bytes += len(entry.content)
+        if self.__over_limit(self._count, self._bytes):
+            self.__evict()
+
+    def _delete(self, url):
+        path = self.__path(url)
+        size = self.__body_size(path)
+        if size is not None:
+            self._count -= 1
+            self._bytes -= size
+        for suffix in ('.meta', '.body'):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+    def __entries(self): #returns (last used, body size, path) for every stored entry, oldest first
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.meta'):
+                continue
+            path = os.path.join(self.directory, name[:-5])
+            try:
+                entries.append((os.path.getmtime(path + '.meta'), os.path.getsize(path + '.body'), path))
+            except OSError:
+                pass
+        entries.sort()
+        return entries
+
+    def __over_limit(self, count, total_bytes):
+        return (self.max_entries is not None and count > self.max_entries) or (self.max_bytes is not None and total_bytes > self.max_bytes)
+
+    def __evict(self): #scans the directory and removes the least recently used entries until both limits are met
+        entries = self.__entries()
+        total_bytes = sum(entry[1] for entry in entries)
+        count = len(entries)
+
+        for used, size, path in entries:
+            if not self.__over_limit(count, total_bytes):
+                break
+            for suffix in ('.meta', '.body'):
+                try:
+                    os.remove(path + suffix)
+                except OSError:
+                    pass
+            count -= 1
+            total_bytes -= size
+            self.evictions += 1
+
+        self._count = count
+        self._bytes = total_bytes
+
+    def clear(self):
+        with self._lock:
+            for used, size, path in self.__entries():
+                for suffix in ('.meta', '.body'):
+                    try:
+                        os.remove(path + suffix)
+                    except OSError:
+                        pass
+            self._count = 0
+            self._bytes = 0
+
+    def __len__(self):
+        return self._count
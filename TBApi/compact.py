@@ -0,0 +1,113 @@
+#TBApi - memory-compact versions of the TBApi model classes.  Each keeps only the raw json that TBA returned, in a __slots__ attribute, and reads a field out of it when that attribute is accessed instead of copying every field into a per-object __dict__
+
+#Returns a read-only attribute that looks up key in the object's raw json.  A missing key raises AttributeError, so hasattr and getattr with a default work as they do on the regular classes
+def raw_field(key):
+    def get(self):
+        try:
+            return self.raw[key]
+        except KeyError:
+            raise AttributeError(key)
+    return property(get)
+
+#Compact version of TBATeam
+class TBACompactTeam:
+    __slots__ = ('raw', '__weakref__') #__weakref__ lets TBAIdentityMap intern these
+
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    website = raw_field('website')
+    name = raw_field('name')
+    locality = raw_field('locality')
+    region = raw_field('region')
+    country_name = raw_field('country_name')
+    location = raw_field('location')
+    team_number = raw_field('team_number')
+    number = raw_field('team_number')
+    key = raw_field('key')
+    nickname = raw_field('nickname')
+    nick = raw_field('nickname')
+    rookie_year = raw_field('rookie_year')
+    motto = raw_field('motto')
+
+#Compact version of TBAEvent
+class TBACompactEvent:
+    __slots__ = ('raw', '__weakref__') #__weakref__ lets TBAIdentityMap intern these
+
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    key = raw_field('key')
+    website = raw_field('website')
+    official = raw_field('official')
+    end_date = raw_field('end_date')
+    name = raw_field('name')
+    short_name = raw_field('short_name')
+    facebook_eid = raw_field('facebook_eid')
+    event_district_string = raw_field('event_district_string')
+    venue_address = raw_field('venue_address')
+    event_district = raw_field('event_district')
+    location = raw_field('location')
+    event_code = raw_field('event_code')
+    year = raw_field('year')
+    webcast = raw_field('webcast')
+    timezone = raw_field('timezone')
+    alliances = raw_field('alliances')
+    event_type_string = raw_field('event_type_string')
+    start_date = raw_field('start_date')
+    event_type = raw_field('event_type')
+
+#Compact version of TBAMatch
+class TBACompactMatch:
+    __slots__ = ('raw', '__weakref__') #__weakref__ lets TBAIdentityMap intern these
+
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    comp_level = raw_field('comp_level')
+    match_number = raw_field('match_number')
+    videos = raw_field('videos')
+    time_string = raw_field('time_string')
+    set_number = raw_field('set_number')
+    key = raw_field('key')
+    time = raw_field('time')
+    score_breakdown = raw_field('score_breakdown')
+    alliances = raw_field('alliances')
+    event_key = raw_field('event_key')
+
+#Compact version of TBAAward
+class TBACompactAward:
+    __slots__ = ('raw',)
+
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    event_key = raw_field('event_key')
+    award_type = raw_field('award_type')
+    type = raw_field('award_type')
+    name = raw_field('name')
+    recipient_list = raw_field('recipient_list')
+    year = raw_field('year')
+
+#Compact version of TBAMedia
+class TBACompactMedia:
+    __slots__ = ('raw',)
+
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    type = raw_field('type')
+    details = raw_field('details')
+    foreign_key = raw_field('foreign_key')
+
+#Compact version of TBARobot
+class TBACompactRobot:
+    __slots__ = ('raw',)
+
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    team_key = raw_field('team_key')
+    name = raw_field('name')
+    key = raw_field('key')
+    year = raw_field('year')
@@ -0,0 +1,122 @@
+#TBApi - resumable season crawler.  Streams every event endpoint for a year to disk with bounded concurrency, checkpointing each finished request so an interrupted crawl picks up where it stopped
+
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+#Endpoints crawled for every event, after the event list
+EVENT_ENDPOINTS = ['teams', 'matches', 'rankings', 'stats', 'awards', 'district_points']
+
+#Class that crawls a season in two dependent stages: the /events/{year} list, then every endpoint in EVENT_ENDPOINTS for each event in it, up to workers (default parser.max_concurrency) at a time
+#Each response is appended to directory/<endpoint>.jsonl as {"path": ..., "event_key": ..., "data": ...} as soon as it arrives, and its path is then appended to directory/checkpoint.txt.  A crawl that is run again skips every checkpointed path.  A crash between the two writes can repeat a line, so readers should keep the last line for each path
+#progress, if given, is called with the dictionary returned by stats() after every request
+class TBASeasonCrawler:
+    def __init__(self, parser, year, directory, workers = None, progress = None):
+        self.parser = parser
+        self.year = year
+        self.directory = directory
+        self.workers = workers or parser.max_concurrency
+        self.progress = progress
+
+        self.total = 0
+        self.completed = 0 #requests finished in this run
+        self.skipped = 0 #requests skipped because an earlier run finished them
+        self.failed = {} #path -> exception for requests that failed in this run.  They are not checkpointed, so the next run retries them
+        self.bytes_written = 0
+        self._started = None
+        self._files = {}
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.checkpoint_path = os.path.join(directory, 'checkpoint.txt')
+
+    def __load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path, 'r') as checkpoint_file:
+            return set(line.strip() for line in checkpoint_file if line.strip())
+
+    def __output(self, name):
+        if name not in self._files:
+            self._files[name] = open(os.path.join(self.directory, name + '.jsonl'), 'ab')
+        return self._files[name]
+
+    def __record(self, name, path, event_key, body): #streams one response to its output file, then checkpoints it.  The data line is synced to disk before the checkpoint line is written, so a crash can leave a response written twice but never checkpointed without its data
+        line = (b'{"path": ' + json.dumps(path).encode('utf-8') + b', "event_key": ' + json.dumps(event_key).encode('utf-8') +
+                b', "data": ' + body.replace(b'\n', b' ') + b'}\n') #raw newlines can only be whitespace in json, so this keeps one response per line without decoding it
+        output = self.__output(name)
+        output.write(line)
+        output.flush()
+        os.fsync(output.fileno())
+        self.bytes_written += len(line)
+
+        self._checkpoint.write(path + '\n')
+        self._checkpoint.flush()
+        os.fsync(self._checkpoint.fileno())
+
+    def __read_events(self, path): #reads the event list saved by an earlier run
+        events = None
+        with open(os.path.join(self.directory, 'events.jsonl'), 'rb') as events_file:
+            for line in events_file:
+                record = json.loads(line)
+                if record['path'] == path:
+                    events = record['data']
+        return events
+
+    def stats(self):
+        elapsed = time.time() - self._started if self._started else 0.0
+        return {'total': self.total, 'completed': self.completed, 'skipped': self.skipped, 'failed': len(self.failed),
+                'remaining': self.total - self.completed - self.skipped - len(self.failed), 'bytes_written': self.bytes_written,
+                'elapsed': elapsed, 'requests_per_second': self.completed / elapsed if elapsed else 0.0}
+
+    def __report(self):
+        if self.progress is not None:
+            self.progress(self.stats())
+
+    def run(self): #crawls the season and returns stats()
+        self._started = time.time()
+        done = self.__load_checkpoint()
+        self._checkpoint = open(self.checkpoint_path, 'a')
+
+        try:
+            events_path = "/events/" + str(self.year)
+            if events_path in done:
+                events = self.__read_events(events_path)
+                self.skipped += 1
+            else:
+                body = self.parser._pull(events_path)
+                events = json.loads(body)
+                self.__record('events', events_path, None, body)
+                self.completed += 1
+
+            tasks = [(endpoint, event['key'], "/event/" + event['key'] + "/" + endpoint) for event in events for endpoint in EVENT_ENDPOINTS]
+            self.total = len(tasks) + 1
+            self.skipped += sum(1 for task in tasks if task[2] in done)
+            tasks = [task for task in tasks if task[2] not in done]
+            self.__report()
+
+            with ThreadPoolExecutor(max_workers = self.workers) as executor:
+                pending = {}
+                tasks.reverse()
+                while tasks or pending:
+                    while tasks and len(pending) < self.workers * 2: #only a couple of requests per worker are queued at once, so finished bodies are written out instead of piling up
+                        endpoint, event_key, path = tasks.pop()
+                        pending[executor.submit(self.parser._pull, path)] = (endpoint, event_key, path)
+
+                    finished, unfinished = wait(list(pending), return_when = FIRST_COMPLETED)
+                    for future in finished:
+                        endpoint, event_key, path = pending.pop(future)
+                        try:
+                            self.__record(endpoint, path, event_key, future.result())
+                            self.completed += 1
+                        except Exception as error:
+                            self.failed[path] = error
+                        self.__report()
+        finally:
+            self._checkpoint.close()
+            for output in self._files.values():
+                output.close()
+            self._files = {}
+
+        return self.stats()
@@ -0,0 +1,33 @@
+#TBApi - json decoding backends and field projection for the bodies TBAParser downloads
+
+import json
+
+#Returns the function used to decode response bodies.  name may be 'orjson', which decodes straight from the body bytes, 'json' for the standard library decoder, or None for orjson if it is installed and json otherwise
+def get_decoder(name = None):
+    if name in (None, 'orjson'):
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError:
+            if name == 'orjson':
+                raise ImportError("[TBA-API] The orjson decoder requires the orjson package.  Install it with 'pip install orjson'")
+    if name in (None, 'json'):
+        return json.loads #accepts bytes too, but decodes them to a str first
+    raise ValueError("[TBA-API] Unknown json decoder '{name}'".format(name = name))
+
+_default_decoder = None
+
+def json_loads(content): #decodes with the fastest decoder available, used by default.  The decoder is looked up on first use, so importing TBApi does not import orjson
+    global _default_decoder
+    if _default_decoder is None:
+        _default_decoder = get_decoder()
+    return _default_decoder(content)
+
+#Sets every field not in fields to None, in place, on a freshly decoded object or on every object in a decoded list, and returns it.  The keys themselves are kept, so model classes can still be built from the result, but nested values nobody asked for (score_breakdown, videos, ...) are released straight away instead of being held by the models.  The whole body is still decoded first, so projection saves memory, not decoding time
+def project(json, fields):
+    fields = frozenset(fields)
+    for raw_json in (json if isinstance(json, list) else [json]):
+        for name in raw_json:
+            if name not in fields:
+                raw_json[name] = None
+    return json
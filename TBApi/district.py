@@ -0,0 +1,137 @@
+#TBApi - district standings computed from every event's /event/{key}/district_points
+
+import numpy as np
+from .models import TBADistrictPoints
+from .export import string_dtype
+
+#TBA event_type values of district championships and district championship divisions, both counted as championships
+CHAMPIONSHIP_EVENT_TYPES = (2, 5)
+
+#Per-event point columns, in the order they are stored
+POINT_FIELDS = ('qual_points', 'elim_points', 'alliance_points', 'award_points', 'total')
+QUAL, ELIM, ALLIANCE, AWARD, TOTAL = range(len(POINT_FIELDS))
+
+#Class that builds district standings.  Every event's points are held in one (teams x events x fields) array, and each team counts its best events_counted regular district events plus every district championship it attended (times championship_multiplier).  Teams are ranked by counted total, then counted elimination points, then best single event qualification points, then counted alliance selection points, then team number
+#update_event replaces one event's points and only recounts the teams that attended it, so standings can follow a weekend of events as they finish
+class TBADistrictStandings:
+    def __init__(self, events_counted = 2, championship_multiplier = 1):
+        self.events_counted = events_counted
+        self.championship_multiplier = championship_multiplier
+        self.teams = [] #team keys in array row order
+        self.team_index = {} #team key -> array row
+        self.events = [] #event keys in array column order.  Earlier events win ties between equal event totals
+        self.event_index = {} #event key -> array column
+        self.points = np.zeros((0, 0, len(POINT_FIELDS)), dtype = np.int32)
+        self.attended = np.zeros((0, 0), dtype = bool)
+        self.championship = np.zeros(0, dtype = bool) #True for district championship columns
+        self.counted = np.zeros((0, len(POINT_FIELDS)), dtype = np.int32) #each team's counted points
+        self.best_qual = np.zeros(0, dtype = np.int32) #each team's best single event qual_points, for tie-breaking
+        self.order = np.zeros(0, dtype = np.intp) #rows in rank order
+        self.ranks = np.zeros(0, dtype = np.int32) #1 based rank of every row
+
+    def __grow(self, team_keys, event_key, championship):
+        new_teams = [team_key for team_key in team_keys if team_key not in self.team_index]
+        for team_key in new_teams:
+            self.team_index[team_key] = len(self.teams)
+            self.teams.append(team_key)
+
+        new_events = 0
+        if event_key not in self.event_index:
+            self.event_index[event_key] = len(self.events)
+            self.events.append(event_key)
+            self.championship = np.append(self.championship, bool(championship))
+            new_events = 1
+        else:
+            self.championship[self.event_index[event_key]] = bool(championship)
+
+        if new_teams or new_events:
+            self.points = np.pad(self.points, ((0, len(new_teams)), (0, new_events), (0, 0)), 'constant')
+            self.attended = np.pad(self.attended, ((0, len(new_teams)), (0, new_events)), 'constant')
+            self.counted = np.pad(self.counted, ((0, len(new_teams)), (0, 0)), 'constant')
+            self.best_qual = np.pad(self.best_qual, (0, len(new_teams)), 'constant')
+
+    def __store(self, event_key, district_points, championship): #writes one event's column and returns the rows whose counted points may have changed
+        if isinstance(district_points, TBADistrictPoints):
+            district_points = district_points.raw
+        points = district_points.get('points') or {}
+
+        self.__grow(points.keys(), event_key, championship)
+        column = self.event_index[event_key]
+        rows = np.flatnonzero(self.attended[:, column]) #teams that were at the event before this update, in case any have been dropped
+
+        self.points[:, column] = 0
+        self.attended[:, column] = False
+        if points:
+            new_rows = np.fromiter((self.team_index[team_key] for team_key in points), dtype = np.intp, count = len(points))
+            self.points[new_rows, column] = [[team_points.get(field, 0) for field in POINT_FIELDS] for team_points in points.values()]
+            self.attended[new_rows, column] = True
+            rows = np.union1d(rows, new_rows)
+        return rows
+
+    def __count(self, rows): #recounts the given rows: best events_counted regular events, plus championships
+        points = self.points[rows]
+        attended = self.attended[rows]
+        regular = attended & ~self.championship
+
+        totals = np.where(regular, points[:, :, TOTAL], -1) #events that can not be counted sort last
+        best = np.argsort(-totals, axis = 1, kind = 'stable')[:, :self.events_counted]
+        best_points = np.take_along_axis(points, best[:, :, None], axis = 1)
+        best_valid = np.take_along_axis(regular, best, axis = 1)
+
+        counted = (best_points * best_valid[:, :, None]).sum(axis = 1)
+        counted += self.championship_multiplier * (points * (attended & self.championship)[:, :, None]).sum(axis = 1)
+
+        self.counted[rows] = counted
+        self.best_qual[rows] = np.where(attended, points[:, :, QUAL], 0).max(axis = 1) if points.shape[1] else 0
+
+    def __rank(self):
+        numbers = np.array([int(team_key[3:]) if team_key[3:].isdigit() else 0 for team_key in self.teams], dtype = np.int64)
+        order = np.lexsort((numbers, -self.counted[:, ALLIANCE], -self.best_qual, -self.counted[:, ELIM], -self.counted[:, TOTAL])) #last key sorts first
+        self.order = order[self.attended[order].any(axis = 1)] #teams dropped from every event they were listed at are not ranked
+        self.ranks = np.zeros(len(self.teams), dtype = np.int32)
+        self.ranks[self.order] = np.arange(1, len(self.order) + 1)
+
+    def add_events(self, event_points, championship_keys = ()): #event_points maps event key -> TBADistrictPoints (or its raw json).  championship_keys lists the district championship events among them.  Returns self so calls can be chained
+        for event_key, district_points in event_points.items():
+            self.__store(event_key, district_points, event_key in championship_keys)
+        self.__count(np.arange(len(self.teams)))
+        self.__rank()
+        return self
+
+    def update_event(self, event_key, district_points, championship = None): #replaces one event's points and recounts only the teams at it.  championship defaults to what the event was added as
+        if championship is None:
+            championship = event_key in self.event_index and bool(self.championship[self.event_index[event_key]])
+        rows = self.__store(event_key, district_points, championship)
+        if len(rows):
+            self.__count(rows)
+        self.__rank()
+        return self
+
+    def ranking(self): #team keys, first place first
+        return [self.teams[row] for row in self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def get_rank(self, team_key): #the team's rank, starting at 1, or None if the team is not ranked
+        row = self.team_index.get(team_key)
+        return None if row is None or not self.ranks[row] else int(self.ranks[row])
+
+    def get_team(self, team_key): #dictionary of the team's rank, counted points (one entry per POINT_FIELDS name), best single event qual_points and the events attended
+        row = self.team_index[team_key]
+        team = dict((field, int(self.counted[row, position])) for position, field in enumerate(POINT_FIELDS))
+        team['rank'] = int(self.ranks[row])
+        team['best_qual_points'] = int(self.best_qual[row])
+        team['events'] = [self.events[column] for column in np.flatnonzero(self.attended[row])]
+        return team
+
+    def to_array(self): #structured array of the standings in rank order, with a team, rank and best_qual_points field plus one field per POINT_FIELDS name
+        team_keys = np.array(self.teams, dtype = string_dtype(self.teams))[self.order]
+        dtype = [('team', team_keys.dtype), ('rank', np.int32)] + [(field, np.int32) for field in POINT_FIELDS] + [('best_qual_points', np.int32)]
+        table = np.zeros(len(self.order), dtype = dtype)
+        table['team'] = team_keys
+        table['rank'] = self.ranks[self.order]
+        for position, field in enumerate(POINT_FIELDS):
+            table[field] = self.counted[self.order, position]
+        table['best_qual_points'] = self.best_qual[self.order]
+        return table
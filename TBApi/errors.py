@@ -0,0 +1,9 @@
+#TBApi - exceptions raised by TBApi
+
+#Raised when TBA answers a request with an error status (after any retries), instead of trying to decode the error body as data
+class TBAError(Exception):
+    def __init__(self, url, status_code, body = None):
+        Exception.__init__(self, "[TBA-API] {status} returned for {url}".format(status = status_code, url = url))
+        self.url = url
+        self.status_code = status_code
+        self.body = body
@@ -0,0 +1,40 @@
+#TBApi - case-insensitive prefix index over a year's event names, used by calc_event_key and find_event_keys
+
+from bisect import bisect_left
+
+#Class that indexes a /events/{year} json list by lowercased short_name and name.  Each field is kept as a sorted list, so a prefix lookup is two binary searches instead of a scan of every event
+class TBAEventIndex:
+    def __init__(self, events_json, fields = ('short_name', 'name')):
+        self.fields = fields
+        self.events = dict((event['key'], event) for event in events_json)
+        self._names = {} #field -> sorted list of lowercased names
+        self._keys = {} #field -> event keys, in the same order as _names
+
+        for field in fields:
+            entries = sorted((str(event[field]).lower(), event['key']) for event in events_json if event.get(field))
+            self._names[field] = [entry[0] for entry in entries]
+            self._keys[field] = [entry[1] for entry in entries]
+
+    def find(self, name, fields = None): #returns the keys of every event whose name in any of fields (default: all indexed fields) starts with name, ignoring case, in key order
+        prefix = name.lower()
+        found = set()
+        for field in (fields or self.fields):
+            names = self._names[field]
+            position = bisect_left(names, prefix)
+            while position < len(names) and names[position].startswith(prefix):
+                found.add(self._keys[field][position])
+                position += 1
+        return sorted(found)
+
+    def find_many(self, names, fields = None): #returns {name: [event keys]} for every name in names
+        return dict((name, self.find(name, fields)) for name in names)
+
+    def calc_event_key(self, name): #old calc_event_key behavior: matches short_name only, and returns '0' if no events are found, '1' if more than one event is found, and the event key otherwise
+        keys = self.find(name, ('short_name',))
+        if len(keys) > 1:
+            print("Multiple events found. Please refine your search.")
+            return '1'
+        if len(keys) == 0:
+            print('No events found. Please ensure spelling and capitalization are correct.')
+            return '0'
+        return keys[0]
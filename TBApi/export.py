@@ -0,0 +1,107 @@
+#TBApi - columnar NumPy exports of lists of TBApi objects, so analysis can be vectorized instead of looping over objects
+
+import numpy as np
+
+#Returns the raw json behind a TBApi object, or the object itself if it is already raw json
+def raw_json(obj):
+    return getattr(obj, 'raw', obj)
+
+#Converts a team key ('frc2403', or 'frc2403B' for older B-teams) or number to an integer team number.  Returns 0 for an empty slot
+def team_key_number(team_key):
+    digits = ''.join(char for char in str(team_key) if char.isdigit())
+    return int(digits) if digits else 0
+
+#Returns a fixed width unicode dtype wide enough for every string in values
+def string_dtype(values):
+    return 'U%d' % max([1] + [len(value) for value in values])
+
+#Flattens the numeric fields of one alliance's score_breakdown into {prefix_field: value}.  Nested dictionaries are flattened with '_', booleans become 0/1 and non-numeric fields are skipped
+def flatten_breakdown(breakdown, prefix, flat = None):
+    if flat is None:
+        flat = {}
+    for field, value in breakdown.items():
+        name = prefix + '_' + field
+        if isinstance(value, dict):
+            flatten_breakdown(value, name, flat)
+        elif isinstance(value, (bool, int, float)):
+            flat[name] = float(value)
+    return flat
+
+#Builds a record array from a list of column names, a list of dtypes and a list of column value lists
+def build_records(names, dtypes, columns, length):
+    records = np.zeros(length, dtype = list(zip(names, dtypes)))
+    for name, column in zip(names, columns):
+        records[name] = column
+    return records.view(np.recarray)
+
+#Converts a list of TBAMatch objects (or raw match json) into a NumPy record array with one row per match.
+#Columns: key, event_key, comp_level, set_number, match_number, time (0 if unscheduled), red1-3, blue1-3 (team numbers, 0 if empty), red_score, blue_score
+#With breakdown, every numeric score_breakdown field is added as a float column named red_<field> / blue_<field>, NaN where a match does not have it
+def matches_to_array(matches, breakdown = True):
+    raw_list = [raw_json(match) for match in matches]
+
+    names = ['key', 'event_key', 'comp_level', 'set_number', 'match_number', 'time',
+             'red1', 'red2', 'red3', 'blue1', 'blue2', 'blue3', 'red_score', 'blue_score']
+
+    keys = [raw['key'] for raw in raw_list]
+    event_keys = [raw['event_key'] for raw in raw_list]
+    comp_levels = [raw['comp_level'] for raw in raw_list]
+    columns = [keys, event_keys, comp_levels,
+               [raw['set_number'] or 0 for raw in raw_list],
+               [raw['match_number'] or 0 for raw in raw_list],
+               [raw['time'] or 0 for raw in raw_list]]
+    dtypes = [string_dtype(keys), string_dtype(event_keys), string_dtype(comp_levels), 'i4', 'i4', 'i8']
+
+    for color in ('red', 'blue'):
+        alliance_teams = [list(raw['alliances'][color]['teams']) + [None] * 3 for raw in raw_list]
+        for slot in range(3):
+            columns.append([team_key_number(teams[slot]) if teams[slot] else 0 for teams in alliance_teams])
+            dtypes.append('i4')
+    for color in ('red', 'blue'):
+        columns.append([raw['alliances'][color]['score'] for raw in raw_list])
+        dtypes.append('i4')
+
+    if breakdown:
+        flat_list = []
+        breakdown_names = {}
+        for raw in raw_list:
+            flat = {}
+            for color in ('red', 'blue'):
+                if raw.get('score_breakdown') and raw['score_breakdown'].get(color):
+                    flatten_breakdown(raw['score_breakdown'][color], color, flat)
+            flat_list.append(flat)
+            for name in flat:
+                breakdown_names[name] = None #dict used as an ordered set so columns keep TBA's field order
+
+        for name in breakdown_names:
+            names.append(name)
+            columns.append([flat.get(name, np.nan) for flat in flat_list])
+            dtypes.append('f8')
+
+    return build_records(names, dtypes, columns, len(raw_list))
+
+#Converts a list of TBATeam objects (or raw team json) into a NumPy record array with one row per team
+#Columns: key, team_number, nickname, name, rookie_year (0 if unknown), locality, region, country_name
+def teams_to_array(teams):
+    raw_list = [raw_json(team) for team in teams]
+
+    names = ['key', 'team_number', 'nickname', 'name', 'rookie_year', 'locality', 'region', 'country_name']
+    columns = []
+    dtypes = []
+    for name in names:
+        if name in ('team_number', 'rookie_year'):
+            columns.append([raw[name] or 0 for raw in raw_list])
+            dtypes.append('i4')
+        else:
+            column = [raw[name] or '' for raw in raw_list]
+            columns.append(column)
+            dtypes.append(string_dtype(column))
+
+    return build_records(names, dtypes, columns, len(raw_list))
+
+#Converts a TBAEventRankings object into a NumPy record array with one row per team, ordered by rank
+#Each ranking column becomes a field named after its normalized header (for example "Qual Avg" -> qual_avg, "Record (W-L-T)" -> record).  Columns whose values are all numbers are floats, every other column is a string
+def rankings_to_array(rankings):
+    order = np.argsort(rankings.table[rankings.columns[0]], kind = 'stable') if rankings.columns else []
+    columns = [rankings.table[name][order] for name in rankings.columns]
+    return build_records(rankings.columns, [column.dtype for column in columns], columns, len(rankings))
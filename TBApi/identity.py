@@ -0,0 +1,57 @@
+#TBApi - identity map that lets a TBAParser hand back one shared model object per team, event and match key instead of a new copy on every call
+
+import threading
+from weakref import WeakValueDictionary
+from .models import TBATeam, TBAEvent, TBAMatch
+from .compact import TBACompactTeam, TBACompactEvent, TBACompactMatch
+
+#Class that interns model objects by (class, key).  Objects are only held through weak references, so an entity is forgotten once nothing else uses it, and memory follows the number of distinct entities in use rather than the number of calls made.  When the same key arrives with different json, the existing object is updated in place, so every holder sees the fresher data
+class TBAIdentityMap:
+    model_classes = frozenset([TBATeam, TBAEvent, TBAMatch, TBACompactTeam, TBACompactEvent, TBACompactMatch]) #classes with a 'key' field that are interned.  Everything else is built normally
+
+    def __init__(self):
+        self.hits = 0 #objects handed back from the map
+        self.misses = 0 #objects built and added to the map
+        self.updates = 0 #hits whose json had changed, and were updated in place
+        self._objects = WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __intern(self, model_class, raw_json): #must be called with _lock held
+        key = raw_json.get('key')
+        if key is None:
+            return model_class(raw_json)
+
+        model = self._objects.get((model_class, key))
+        if model is None:
+            self.misses += 1
+            model = model_class(raw_json)
+            self._objects[(model_class, key)] = model
+            return model
+
+        self.hits += 1
+        if model.raw is not raw_json and model.raw != raw_json: #unchanged json is dropped so only one copy is kept
+            self.updates += 1
+            model.__init__(raw_json) #every model class sets all of its fields from raw_json, so re-running __init__ refreshes it in place
+        return model
+
+    def intern(self, model_class, raw_json): #returns the shared model_class object for raw_json's key, creating or updating it as needed
+        with self._lock:
+            return self.__intern(model_class, raw_json)
+
+    def intern_list(self, model_class, json_list): #intern for every item in json_list, taking the lock once
+        with self._lock:
+            return [self.__intern(model_class, raw_json) for raw_json in json_list]
+
+    def get(self, model_class, key): #returns the live object for key, or None if there is none
+        with self._lock:
+            return self._objects.get((model_class, key))
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def stats(self): #returns the identity map counters as a dictionary
+        return {'hits': self.hits, 'misses': self.misses, 'updates': self.updates, 'entries': len(self)}
@@ -0,0 +1,176 @@
+#TBApi - instrumentation hooks for TBAParser's request path.  Listeners are told about every request, decode, model build, retry and cache event, keyed by endpoint template (for example /event/{event_key}/matches)
+
+import threading
+from bisect import bisect_left
+
+#Segments that follow each of these path segments are replaced with a placeholder by endpoint_template
+PATH_PLACEHOLDERS = {'team': '{team_key}', 'event': '{event_key}', 'match': '{match_key}', 'district': '{district_key}',
+                     'teams': '{page}', 'events': '{year}', 'districts': '{year}'}
+
+#Turns a request path into its endpoint template, so that metrics for different teams, events and years are grouped together.  /team/frc2403/2016/media -> /team/{team_key}/{year}/media
+def endpoint_template(path):
+    segments = path.split('?', 1)[0].strip('/').split('/')
+    template = []
+    for position, segment in enumerate(segments):
+        previous = segments[position - 1] if position > 0 else None
+        if previous in PATH_PLACEHOLDERS and template[-1] == previous:
+            template.append(PATH_PLACEHOLDERS[previous])
+        elif segment.isdigit() and len(segment) == 4:
+            template.append('{year}')
+        else:
+            template.append(segment)
+    return '/' + '/'.join(template)
+
+#Base class for TBAParser listeners.  Every hook does nothing, so a listener only needs to override the hooks it cares about
+class TBAInstrumentation:
+    def on_request(self, endpoint, status, seconds, response_bytes): #an HTTP request finished.  seconds excludes time spent waiting on the rate limiter or for a free request slot
+        pass
+
+    def on_retry(self, endpoint, status, attempt): #a throttled or failed response is about to be retried
+        pass
+
+    def on_cache(self, endpoint, event): #event is 'hit' (answered from the cache), 'miss', 'revalidated' (a 304 reused the cached body) 'coalesced' (shared another thread's request) or 'refreshed' (answered by a TBARefresher from its last background refresh)
+        pass
+
+    def on_decode(self, endpoint, seconds, response_bytes): #a response body was decoded from json
+        pass
+
+    def on_build(self, endpoint, model_name, count, seconds): #count model_name objects were built from the json of an endpoint
+        pass
+
+#Listener that forwards every hook to each listener in a list, so several can be attached to one parser
+class TBAInstrumentationGroup(TBAInstrumentation):
+    def __init__(self, listeners):
+        self.listeners = list(listeners)
+
+    def on_request(self, *args):
+        for listener in self.listeners:
+            listener.on_request(*args)
+
+    def on_retry(self, *args):
+        for listener in self.listeners:
+            listener.on_retry(*args)
+
+    def on_cache(self, *args):
+        for listener in self.listeners:
+            listener.on_cache(*args)
+
+    def on_decode(self, *args):
+        for listener in self.listeners:
+            listener.on_decode(*args)
+
+    def on_build(self, *args):
+        for listener in self.listeners:
+            listener.on_build(*args)
+
+#Fixed bucket histogram.  bounds are the upper edges of each bucket; values above the last bound go in an overflow bucket
+class TBAHistogram:
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction): #returns the upper bound of the bucket holding the given fraction (0-1) of values
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for position, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return self.bounds[position] if position < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean(), 'min': self.min, 'max': self.max,
+                'p50': self.percentile(0.5), 'p90': self.percentile(0.9), 'p99': self.percentile(0.99)}
+
+SECONDS_BOUNDS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+BYTES_BOUNDS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216]
+
+#Counters and histograms for one endpoint template
+class TBAEndpointMetrics:
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.requests = 0
+        self.statuses = {} #status code -> count
+        self.retries = 0
+        self.cache = {} #cache event -> count
+        self.latency = TBAHistogram(SECONDS_BOUNDS)
+        self.response_bytes = TBAHistogram(BYTES_BOUNDS)
+        self.decode = TBAHistogram(SECONDS_BOUNDS)
+        self.build = TBAHistogram(SECONDS_BOUNDS)
+        self.objects_built = 0
+
+    def to_dict(self):
+        return {'requests': self.requests, 'statuses': dict(self.statuses), 'retries': self.retries, 'cache': dict(self.cache),
+                'latency': self.latency.to_dict(), 'response_bytes': self.response_bytes.to_dict(), 'decode': self.decode.to_dict(),
+                'build': self.build.to_dict(), 'objects_built': self.objects_built}
+
+#Listener that aggregates every hook into a TBAEndpointMetrics per endpoint template
+class TBAMetrics(TBAInstrumentation):
+    def __init__(self):
+        self.endpoints = {} #endpoint template -> TBAEndpointMetrics
+        self._lock = threading.Lock()
+
+    def __endpoint(self, endpoint):
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints.setdefault(endpoint, TBAEndpointMetrics(endpoint))
+        return metrics
+
+    def on_request(self, endpoint, status, seconds, response_bytes):
+        with self._lock:
+            metrics = self.__endpoint(endpoint)
+            metrics.requests += 1
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.latency.add(seconds)
+            metrics.response_bytes.add(response_bytes)
+
+    def on_retry(self, endpoint, status, attempt):
+        with self._lock:
+            self.__endpoint(endpoint).retries += 1
+
+    def on_cache(self, endpoint, event):
+        with self._lock:
+            cache = self.__endpoint(endpoint).cache
+            cache[event] = cache.get(event, 0) + 1
+
+    def on_decode(self, endpoint, seconds, response_bytes):
+        with self._lock:
+            self.__endpoint(endpoint).decode.add(seconds)
+
+    def on_build(self, endpoint, model_name, count, seconds):
+        with self._lock:
+            metrics = self.__endpoint(endpoint)
+            metrics.build.add(seconds)
+            metrics.objects_built += count
+
+    def snapshot(self): #returns {endpoint template: metrics dictionary}
+        with self._lock:
+            return dict((endpoint, metrics.to_dict()) for endpoint, metrics in self.endpoints.items())
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def report(self): #returns a table summarizing every endpoint
+        lines = ['{0:<40}{1:>8}{2:>10}{3:>10}{4:>10}{5:>10}{6:>8}{7:>8}'.format('endpoint', 'requests', 'p50 ms', 'p90 ms', 'decode ms', 'build ms', 'hits', 'retries')]
+        for endpoint, metrics in sorted(self.snapshot().items()):
+            lines.append('{0:<40}{1:>8}{2:>10.1f}{3:>10.1f}{4:>10.2f}{5:>10.2f}{6:>8}{7:>8}'.format(
+                endpoint, metrics['requests'], metrics['latency']['p50'] * 1000, metrics['latency']['p90'] * 1000,
+                metrics['decode']['mean'] * 1000, metrics['build']['mean'] * 1000, metrics['cache'].get('hit', 0), metrics['retries']))
+        return '\n'.join(lines)
@@ -0,0 +1,136 @@
+#TBApi - in-memory index over match lists from any number of events, with lookups by team, event, comp level and scheduled time
+
+import re
+from bisect import bisect_left, insort
+from .models import TBAMatch
+
+#Order comp levels are played in
+COMP_LEVELS = ('qm', 'ef', 'qf', 'sf', 'f')
+ELIMINATION_LEVELS = ('ef', 'qf', 'sf', 'f')
+LEVEL_ORDER = dict((level, position) for position, level in enumerate(COMP_LEVELS))
+
+MATCH_KEY = re.compile(r'^(?P<event_key>\d{4}[a-z0-9]+)_(?P<comp_level>qm|ef|qf|sf|f)(?:(?P<set_number>\d+)?m)?(?P<match_number>\d+)$')
+
+#Splits a match key such as '2016casj_qm12' or '2016casj_qf2m1' into (event_key, comp_level, set_number, match_number).  Qualification keys carry no set number, so 1 is returned for them, as TBA does.  Raises ValueError for anything that is not a match key
+def parse_match_key(match_key):
+    found = MATCH_KEY.match(match_key)
+    if found is None:
+        raise ValueError("[TBA-API] '{key}' is not a match key".format(key = match_key))
+    set_number = found.group('set_number')
+    return found.group('event_key'), found.group('comp_level'), int(set_number) if set_number else 1, int(found.group('match_number'))
+
+#Builds the key TBA uses for a match.  Qualification keys have no set number ('2016casj_qm12'); every other level needs one ('2016casj_qf2m1')
+def build_match_key(event_key, comp_level, match_number, set_number = None):
+    if comp_level == 'qm':
+        return event_key + '_qm' + str(match_number)
+    if set_number is None:
+        raise ValueError("[TBA-API] {level} match keys need a set number".format(level = comp_level))
+    return event_key + '_' + comp_level + str(set_number) + 'm' + str(match_number)
+
+#Returns True once a match has a score.  TBA sends -1 (or nothing) for both alliances until a match is played
+def match_played(match):
+    score = match.alliances['red'].get('score')
+    return score is not None and score >= 0
+
+def match_teams(match): #team keys on both alliances
+    return match.alliances['red']['teams'] + match.alliances['blue']['teams']
+
+#Class that indexes TBAMatch (or TBACompactMatch) objects by key, team, event, (event, comp level, set, match number) and scheduled time.  Each query looks up the few matches it needs instead of scanning every match held, so a full season can be queried repeatedly.  Results are in play order: by scheduled time, with unscheduled matches last, then by comp level, set and match number
+class TBAMatchIndex:
+    def __init__(self, matches = ()):
+        self.matches = {} #match key -> match
+        self._by_team = {} #team key -> set of match keys
+        self._by_event = {} #event key -> set of match keys
+        self._by_number = {} #(event key, comp level, set number, match number) -> match key
+        self._times = [] #sorted (time, match key) for every match with a scheduled time
+        self._order = {} #match key -> sort key giving play order
+        self._indexed = {} #match key -> (time, team keys, number key) as they were indexed.  remove uses these rather than the match, which an identity map may have updated in place since
+        self.add(matches)
+
+    def add(self, matches): #adds matches, given as match objects or raw json, replacing any already held with the same key.  Returns self so calls can be chained
+        for match in matches:
+            if isinstance(match, dict):
+                match = TBAMatch(match)
+            if match.key in self.matches:
+                self.remove(match.key)
+
+            key = match.key
+            team_keys = tuple(match_teams(match))
+            number = (match.event_key, match.comp_level, match.set_number, match.match_number)
+            self.matches[key] = match
+            self._indexed[key] = (match.time, team_keys, number)
+            for team_key in team_keys:
+                self._by_team.setdefault(team_key, set()).add(key)
+            self._by_event.setdefault(match.event_key, set()).add(key)
+            self._by_number[number] = key
+            if match.time is not None:
+                insort(self._times, (match.time, key))
+            self._order[key] = (match.time is None, match.time or 0, match.event_key, LEVEL_ORDER.get(match.comp_level, len(COMP_LEVELS)), match.set_number, match.match_number)
+        return self
+
+    def remove(self, match_key): #drops a match from every index
+        del self.matches[match_key]
+        time, team_keys, number = self._indexed.pop(match_key)
+        for team_key in team_keys:
+            self._by_team[team_key].discard(match_key)
+        self._by_event[number[0]].discard(match_key)
+        del self._by_number[number]
+        if time is not None:
+            del self._times[bisect_left(self._times, (time, match_key))]
+        del self._order[match_key]
+
+    def __len__(self):
+        return len(self.matches)
+
+    def __contains__(self, match_key):
+        return match_key in self.matches
+
+    def __sorted(self, match_keys):
+        return [self.matches[key] for key in sorted(match_keys, key = self._order.__getitem__)]
+
+    def get(self, match_key): #returns the match with match_key, or None
+        return self.matches.get(match_key)
+
+    def find(self, event_key, comp_level, match_number, set_number = 1): #returns a match by its place in an event, or None
+        match_key = self._by_number.get((event_key, comp_level, set_number, match_number))
+        return None if match_key is None else self.matches[match_key]
+
+    def teams(self): #every team key that appears in the index
+        return sorted(team_key for team_key, match_keys in self._by_team.items() if match_keys)
+
+    def events(self): #every event key that appears in the index
+        return sorted(event_key for event_key, match_keys in self._by_event.items() if match_keys)
+
+    def event_matches(self, event_key, comp_levels = None): #matches at an event, optionally only those in comp_levels
+        match_keys = self._by_event.get(event_key, ())
+        if comp_levels is not None:
+            match_keys = [key for key in match_keys if self.matches[key].comp_level in comp_levels]
+        return self.__sorted(match_keys)
+
+    def team_matches(self, team_key, event_key = None, comp_levels = None, played = None): #matches a team is in, optionally limited to one event, to comp_levels, and to played (True) or unplayed (False) matches
+        match_keys = self._by_team.get(team_key, set())
+        if event_key is not None:
+            match_keys = match_keys & self._by_event.get(event_key, set())
+        matches = self.__sorted(match_keys)
+        if comp_levels is not None:
+            matches = [match for match in matches if match.comp_level in comp_levels]
+        if played is not None:
+            matches = [match for match in matches if match_played(match) == played]
+        return matches
+
+    def team_eliminations(self, team_key, event_key = None): #elimination matches a team played in
+        return self.team_matches(team_key, event_key, ELIMINATION_LEVELS)
+
+    def scheduled(self, start = None, end = None): #matches scheduled at or after start and before end (unix times).  Either bound may be left out
+        low = 0 if start is None else bisect_left(self._times, (start, ''))
+        high = len(self._times) if end is None else bisect_left(self._times, (end, ''))
+        return [self.matches[key] for time, key in self._times[low:high]]
+
+    def next_match(self, team_key, after = None): #the team's first unplayed match, in play order, scheduled at or after after if it is given.  Returns None if there is none
+        for match in self.team_matches(team_key, played = False):
+            if after is None or (match.time is not None and match.time >= after):
+                return match
+        return None
+
+    def next_matches(self, team_keys, after = None): #{team key: next_match} for every team in team_keys
+        return dict((team_key, self.next_match(team_key, after)) for team_key in team_keys)
@@ -0,0 +1,319 @@
+#TBApi - model classes wrapping the json TBA returns.  Kept free of any third party imports so that importing them is cheap
+
+#Class that defines an FRC team. Variables are automatically set when created. raw variable contains the raw json array that TBA returned
+class TBATeam:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.website = raw_json['website']
+        self.name = raw_json['name']
+        self.locality = raw_json['locality']
+        self.region = raw_json['region']
+        self.country_name = raw_json['country_name']
+        self.location = raw_json['location']
+        self.team_number = raw_json['team_number']
+        self.number = raw_json['team_number']
+        self.key = raw_json['key']
+        self.nickname = raw_json['nickname']
+        self.nick = raw_json['nickname']
+        self.rookie_year = raw_json['rookie_year']
+        self.motto = raw_json['motto']
+
+#Class that defines an FRC event. Variables are automatically set when created. raw variable contains the raw json array that TBA returned
+class TBAEvent:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.key = raw_json['key']
+        self.website = raw_json['website']
+        self.official = raw_json['official']
+        self.end_date = raw_json['end_date']
+        self.name = raw_json['name']
+        self.short_name = raw_json['short_name']
+        self.facebook_eid = raw_json['facebook_eid']
+        self.event_district_string = raw_json['event_district_string']
+        self.venue_address = raw_json['venue_address']
+        self.event_district = raw_json['event_district']
+        self.location = raw_json['location']
+        self.event_code = raw_json['event_code']
+        self.year = raw_json['year']
+        self.webcast = raw_json['webcast']
+        self.timezone = raw_json['timezone']
+        self.alliances = raw_json['alliances']
+        self.event_type_string = raw_json['event_type_string']
+        self.start_date = raw_json['start_date']
+        self.event_type = raw_json['event_type']
+
+#Class that defines the stats from a given event.  raw variable contains the raw json array that is returned by the blue alliance API.  Due to TBA not being consistant in what they return, not all values will be present with data on each call.
+class TBAEventStats:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        try:
+            self.opr = TBAEventStatsCategory(raw_json["oprs"]) #sets up a TBAEventStatsCategory for the OPR stat if it is passed back by TBA
+        except:
+            pass
+        try:
+            self.ccwm = TBAEventStatsCategory(raw_json["ccwms"]) #sets up a TBAEventStatsCategory for the CCWM stat if it is passed back by TBA
+        except:
+            pass
+        try:
+            self.dpr = TBAEventStatsCategory(raw_json["dprs"]) #sets up a TBAEventStatsCategory for the DPR stat if it is passed back by TBA
+        except:
+            pass
+        try:
+            self.year_specific = raw_json['year_specific'] #sets up a TBAEventStatsCategory for the Year Specific Stats if it they are passed back by TBA
+        except:
+            pass
+
+#Class that defines the event stats under a given category (opr, ccwm, dpr, year_specific) with a method to get the stats under this category given a team_key or team_number
+class TBAEventStatsCategory:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+
+    def get_team(self, team_number): #get the stats value for a given team
+        if not isinstance(team_number, str):
+            team_number = str(team_number)
+        else:
+            if team_number.startswith('frc'):
+                team_number = team_number[3:]
+
+        if not team_number.isdigit():
+            print("\n[TBA-API] BAD TEAM NUMBER SUPLIED WITH TBAEventStatsObj.get_team(team_number)\n")
+            return
+
+        team_stat = self.raw[team_number]
+        return team_stat
+
+#Converts a ranking table header into the attribute name used for it by TBAEventTeamRank and TBAEventRankings.column
+def rank_column_name(key):
+    if key == "Record (W-L-T)":
+        key = "record"
+    return key.lower().replace(" ", "_").replace("&","and").replace("/","_").replace("-","_")
+
+def is_integer_value(value): #True for whole numbers, whether TBA sent them as numbers or as strings such as team numbers ('2403')
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, str) and value.lstrip('-').isdigit()
+
+#Converts a ranking column into a NumPy array.  Columns of whole numbers (rank, team, played, ...) are int arrays, columns of other numbers are float arrays, and every other column is a string array
+def rank_column_array(values, np):
+    if all(is_integer_value(value) for value in values):
+        return np.array([int(value) for value in values], dtype = np.int64)
+    try:
+        return np.array([float(value) for value in values], dtype = float)
+    except (TypeError, ValueError):
+        return np.array([str(value) for value in values])
+
+#Class that defines the rankings of a given event as a table with one NumPy array per column, and provides methods to get the TBAEventTeamRank objects for given teams or event ranks, and to sort and filter by any column.  The raw json passed in is never modified
+class TBAEventRankings:
+    def __init__(self, raw_json):
+        import numpy as np #imported here so that only code using rankings pays for loading numpy
+
+        self.raw_table = raw_json #the json exactly as TBA returned it, header row included
+        self.keys = raw_json[0] if raw_json else []
+        self.rows = raw_json[1:] #ranking rows without the header row
+        self.raw = self.rows #as before, raw holds the ranking rows only
+        self.columns = [rank_column_name(key) for key in self.keys] #headers are normalized once per table, not once per row
+        self.column_positions = dict((name, position) for position, name in enumerate(self.columns))
+
+        self.table = {} #column name -> array of that column's values, as built by rank_column_array
+        for position, name in enumerate(self.columns):
+            self.table[name] = rank_column_array([row[position] for row in self.rows], np)
+
+        self._rank_index = dict((str(row[0]), position) for position, row in enumerate(self.rows)) #event rank -> row
+        self._team_index = dict((str(row[1]), position) for position, row in enumerate(self.rows)) #team number -> row
+        self._views = {} #row -> TBAEventTeamRank, built the first time a row is asked for
+        self._rankings = None #rankings and team_rankings dictionaries, built the first time they are used
+        self._team_rankings = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self): #iterates over every TBAEventTeamRank in TBA's order
+        for position in range(len(self.rows)):
+            yield self.row(position)
+
+    def row(self, position): #gets the TBAEventTeamRank obj for a row of the table
+        view = self._views.get(position)
+        if view is None:
+            view = TBAEventTeamRank(self.keys, self.rows[position], self.column_positions)
+            self._views[position] = view
+        return view
+
+    def column(self, name): #gets the array of values of a column, by its normalized name (for example 'qual_avg' or 'record')
+        return self.table[name]
+
+    @property
+    def rankings(self): #dictionary of event rank -> TBAEventTeamRank obj
+        if self._rankings is None:
+            self._rankings = dict((rank, self.row(position)) for rank, position in self._rank_index.items())
+        return self._rankings
+
+    @property
+    def team_rankings(self): #dictionary of team number -> TBAEventTeamRank obj
+        if self._team_rankings is None:
+            self._team_rankings = dict((team_number, self.row(position)) for team_number, position in self._team_index.items())
+        return self._team_rankings
+
+    def get_rank(self, rank): #gets the TBAEventTeamRank obj for a given event rank
+        team_obj = self.row(self._rank_index[str(rank)])
+        return team_obj
+
+    def get_rank_by_team(self, team_number): #gets the TBAEventTeamRank obj for a given team number
+        if not isinstance(team_number, str):
+            team_number = str(team_number)
+        else:
+            if team_number.startswith('frc'):
+                team_number = team_number[3:]
+
+        if not team_number.isdigit():
+            print("\n[TBA-API] BAD TEAM NUMBER SUPLIED WITH TBAEventRankings.get_rank_by_team(team_number)\n")
+            return
+
+        team_obj = self.row(self._team_index[team_number])
+
+        return team_obj
+
+    def sort_by(self, name, descending = False): #gets a list of TBAEventTeamRank objs sorted by a column.  Ties keep TBA's order, except when sorting a text column in descending order
+        import numpy as np
+
+        order = np.argsort(self.table[name], kind = 'stable')
+        if descending:
+            order = np.argsort(-self.table[name], kind = 'stable') if self.table[name].dtype.kind in 'if' else order[::-1]
+        return [self.row(position) for position in order]
+
+    def where(self, mask): #gets a list of TBAEventTeamRank objs for the rows where a boolean array (for example rankings.column('played') > 10) is True
+        import numpy as np
+
+        return [self.row(position) for position in np.flatnonzero(mask)]
+
+    def filter(self, name, operator, value): #gets a list of TBAEventTeamRank objs whose value in a column compares true to value.  operator is one of '==', '!=', '<', '<=', '>', '>='.  value is converted to the column's type, so filter('team', '==', '2403') and filter('team', '==', 2403) both work.  Raises TypeError if it can not be
+        column = self.table[name]
+        if column.dtype.kind in 'if':
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise TypeError("[TBA-API] Can not compare the numeric ranking column '{name}' with {value!r}".format(name = name, value = value))
+        elif not isinstance(value, str):
+            raise TypeError("[TBA-API] Can not compare the text ranking column '{name}' with {value!r}".format(name = name, value = value))
+        comparisons = {'==': column.__eq__, '!=': column.__ne__, '<': column.__lt__, '<=': column.__le__, '>': column.__gt__, '>=': column.__ge__}
+        return self.where(comparisons[operator](value))
+
+#Class that gives attribute access to one row of an event's rankings.  Since TBA does not standardize ranking columns, attributes are named after the normalized column headers (see rank_column_name) and are read from the raw row when accessed
+class TBAEventTeamRank:
+    __slots__ = ('raw', 'column_positions')
+
+    def __init__(self, key_list, team_list, column_positions = None): #column_positions maps normalized column names to row positions, and is shared by every row of a TBAEventRankings
+        self.raw = team_list
+        if column_positions is None:
+            column_positions = dict((rank_column_name(key), position) for position, key in enumerate(key_list))
+        self.column_positions = column_positions
+
+    def __getattr__(self, name):
+        if name in TBAEventTeamRank.__slots__ or name.startswith('__'): #unset slots (as on the blank copies made by copy and pickle) and special names are never columns
+            raise AttributeError(name)
+        try:
+            return self.raw[self.column_positions[name]]
+        except (KeyError, IndexError):
+            raise AttributeError(name)
+
+    def __dir__(self):
+        return list(self.column_positions) + ['raw', 'column_positions']
+
+#Class that defines the District Points from a given event.  This is by event, but the event term has been removed from the class name to prevent issues that arise with long class names
+class TBADistrictPoints:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.points = raw_json['points']
+
+    def get_team(self, team_key):
+        if isinstance(team_key, str) and team_key.isdigit():
+            team_key = 'frc' + team_key
+        else:
+            team_key = 'frc' + str(team_key)
+
+        dist_points_json = self.points[team_key]
+
+        dist_points_obj = TBADistrictPointsTeam(dist_points_json)
+
+        return dist_points_obj
+
+#Class that defines the District points of a given team, created by get_team in TBADistrictPoints
+class TBADistrictPointsTeam:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.alliance_points = raw_json['alliance_points']
+        self.total = raw_json['total']
+        self.award_points = raw_json['award_points']
+        self.elim_points = raw_json['elim_points']
+        self.qual_points = raw_json['qual_points']
+
+#Class that defines an FRC match. Variables are automatically set when created. raw variable contains the raw json array that TBA returned
+class TBAMatch:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.comp_level = raw_json['comp_level']
+        self.match_number = raw_json['match_number']
+        self.videos = raw_json['videos']
+        self.time_string = raw_json['time_string']
+        self.set_number = raw_json['set_number']
+        self.key = raw_json['key']
+        self.time = raw_json['time']
+        self.score_breakdown = raw_json['score_breakdown']
+        self.alliances = raw_json['alliances']
+        self.event_key = raw_json['event_key']
+
+#Class that defines an FRC award. Variables are automatically set when created. raw variable contains the raw json array that TBA returned
+class TBAAward:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.event_key = raw_json['event_key']
+        self.award_type = raw_json['award_type']
+        self.type = raw_json['award_type']
+        self.name = raw_json['name']
+        self.recipient_list = raw_json['recipient_list']
+        self.year = raw_json['year']
+
+#Class that defines an FRC media item (video, photo, etc). Variables are automatically set when created. raw variable contains the raw json array that TBA returned
+class TBAMedia:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.type = raw_json['type']
+        self.details = raw_json['details']
+        self.foreign_key = raw_json['foreign_key']
+
+class TBARobotGroup:
+    def __init__(self, raw_json, robot_class = None): #robot_class is the class get_year builds, TBARobot by default
+        self.raw = raw_json
+        self.robot_class = robot_class if robot_class is not None else TBARobot
+
+    def get_year(self, year):
+        year_json = self.raw[str(year)]
+        year_obj = self.robot_class(year_json)
+
+        return year_obj
+
+#Class that defines an FRC robot. Variables are automatically set when created. raw variable contains the raw json array that TBA returned
+class TBARobot:
+    def __init__(self, raw_json):
+        self.raw = raw_json
+        self.team_key = raw_json['team_key']
+        self.name = raw_json['name']
+        self.key = raw_json['key']
+        self.year = raw_json['year']
+
+#Class that collects everything TBA knows about a team, as returned by TBAParser.get_team_profile
+class TBATeamProfile:
+    def __init__(self, team, years_participated, events, awards, robots, districts, media_by_year):
+        self.team = team #TBATeam
+        self.key = team.key
+        self.years_participated = years_participated #list of years
+        self.events = events #list of TBAEvent objects from every year
+        self.awards = awards #list of TBAAward objects from every year
+        self.robots = robots #TBARobotGroup
+        self.districts = districts #dictionary of year -> district key
+        self.media_by_year = media_by_year #dictionary of year -> list of TBAMedia objects.  Empty if media was not requested
+
+    @property
+    def media(self): #list of every TBAMedia object, oldest year first
+        return [media for media_list in self.media_by_year.values() for media in media_list]
@@ -0,0 +1,514 @@
+#TBApi - BLUE ALLIANCE API FOR PYTHON
+
+from threading import Lock, local
+from time import perf_counter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+from .transport import TBATransport
+from .batch import run_batch
+from .event_index import TBAEventIndex
+from .match_index import TBAMatchIndex
+from .decode import get_decoder, json_loads, project
+from .instrument import endpoint_template
+from .errors import TBAError
+from .throttle import TBABackoff, TBARequestCoalescer
+from .compact import TBACompactTeam, TBACompactEvent, TBACompactMatch, TBACompactAward, TBACompactMedia, TBACompactRobot
+from .models import TBATeam, TBAEvent, TBAEventStats, TBAEventRankings, TBADistrictPoints, TBAMatch, TBAAward, TBAMedia, TBARobotGroup, TBARobot, TBATeamProfile
+
+#Maps each model class to its memory-compact counterpart, used by TBAParser when compact_models is set
+COMPACT_MODELS = {TBATeam: TBACompactTeam, TBAEvent: TBACompactEvent, TBAMatch: TBACompactMatch, TBAAward: TBACompactAward, TBAMedia: TBACompactMedia, TBARobot: TBACompactRobot}
+
+#This is the main class. All reuqests are made through here
+class TBAParser:
+    def __init__(self, team_number, package_name, version_number, transport = None, cache = None, max_concurrency = 10, rate_limiter = None, backoff = None, coalesce = True, compact_models = False, instrumentation = None, identity_map = None, decoder = None): #Init method. Requires info to identify the end user of the requests made to TBA.  transport may be any object with get(url, headers) and close() methods, and defaults to a pooled TBATransport.  cache may be a TBAMemoryCache or TBADiskCache.  max_concurrency caps how many requests this parser has in flight at once, across all threads.  rate_limiter may be a TBARateLimiter, and backoff a TBABackoff (defaults to 3 retries).  With coalesce, threads asking for the same url at the same time share one request.  With compact_models, teams, events, matches, awards, media and robots are returned as the __slots__ based TBACompact* classes, which use far less memory.  instrumentation may be a TBAInstrumentation listener such as TBAMetrics; with None, no timing is done at all.  identity_map may be a TBAIdentityMap, in which case teams, events and matches with the same key are returned as one shared object that is updated in place as fresher data arrives.  decoder is the json backend: 'orjson', 'json', any function that decodes bytes, or None for orjson when it is installed
+        self.team_number = team_number
+        self.package_name = package_name
+        self.version_number = version_number
+        self.header = {'X-TBA-App-Id': 'frc{team}:{package}:{version}'.format(team = team_number, package = package_name, version = version_number)}
+        self.baseURL = 'http://www.thebluealliance.com/api/v2'
+
+        self._owns_transport = transport is None #only close transports that this parser created itself
+        if transport is None:
+            transport = TBATransport()
+        self.transport = transport
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self._request_slots = BoundedSemaphore(max_concurrency)
+        self.rate_limiter = rate_limiter
+        self.backoff = backoff if backoff is not None else TBABackoff()
+        self.coalescer = TBARequestCoalescer() if coalesce else None
+        self.compact_models = compact_models
+        self._event_indexes = {} #year -> TBAEventIndex, built once per year by get_event_index
+        self._event_index_lock = Lock()
+        self.instrumentation = instrumentation
+        self.identity_map = identity_map
+        self.decoder = json_loads if decoder is None else decoder if callable(decoder) else get_decoder(decoder) #the default is resolved on first use
+        self.refresher = None #TBARefresher serving hot paths, set by the refresher itself
+        self._local = local() #endpoint of the request each thread is building models for, used by instrumentation
+
+    def close(self): #Closes the parser's transport if the parser created it.  Injected transports are left for their owner to close.  Any TBARefresher attached to the parser is stopped first
+        if self.refresher is not None:
+            self.refresher.stop()
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _pull(self, path, refresh = False, cache = None): #Single request path used by every get_* method. path is relative to baseURL.  Returns the raw response body, answering from the refresher or the cache when they have it fresh, and otherwise sharing any identical request already in flight.  refresh skips the refresher, and is used by the refresher itself.  cache, if given, is used in place of the parser's cache, so watchers and refreshers can make conditional requests without attaching a cache to the parser
+        if self.refresher is not None and not refresh:
+            return self.refresher.pull(path)
+
+        url = self.baseURL + path
+        instrumentation = self.instrumentation
+        if cache is None:
+            cache = self.cache
+
+        if cache is not None:
+            content = cache.get_fresh(url)
+            if instrumentation is not None:
+                instrumentation.on_cache(endpoint_template(path), 'miss' if content is None else 'hit')
+            if content is not None:
+                return content
+
+        if self.coalescer is None:
+            return self.__fetch(url, cache)
+        if instrumentation is None:
+            return self.coalescer.do(url, self.__fetch, url, cache)
+
+        fetched = []
+        def fetch(): #records whether this thread made the request or shared another's
+            fetched.append(True)
+            return self.__fetch(url, cache)
+        content = self.coalescer.do(url, fetch)
+        if not fetched:
+            instrumentation.on_cache(endpoint_template(path), 'coalesced')
+        return content
+
+    def __fetch(self, url, cache): #requests url from TBA, revalidating the copy in cache with If-Modified-Since when there is one
+        if cache is None:
+            response = self.__get(url, self.header)
+            return response.content
+
+        response = self.__get(url, cache.conditional_headers(url, self.header))
+        content = cache.update(url, response)
+        if content is None: #the stale copy was evicted while revalidating it
+            response = self.__get(url, self.header)
+            content = cache.update(url, response)
+        elif response.status_code == 304 and self.instrumentation is not None:
+            self.instrumentation.on_cache(endpoint_template(url[len(self.baseURL):]), 'revalidated')
+        return content
+
+    def __get(self, url, headers): #makes the actual HTTP request, honoring the rate limiter and max_concurrency, and backing off on throttled or failed responses.  Raises TBAError if TBA still answers with an error
+        instrumentation = self.instrumentation
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            with self._request_slots:
+                if instrumentation is None:
+                    response = self.transport.get(url, headers = headers)
+                else:
+                    started = perf_counter()
+                    response = self.transport.get(url, headers = headers)
+                    instrumentation.on_request(endpoint_template(url[len(self.baseURL):]), response.status_code, perf_counter() - started, len(response.content))
+
+            if not self.backoff.should_retry(response, attempt):
+                break
+            if instrumentation is not None:
+                instrumentation.on_retry(endpoint_template(url[len(self.baseURL):]), response.status_code, attempt)
+            self.backoff.wait(response, attempt)
+            attempt += 1
+
+        if response.status_code >= 400:
+            raise TBAError(url, response.status_code, response.content)
+        return response
+
+    def _pull_json(self, path): #decodes the body returned by _pull
+        if self.instrumentation is None:
+            return self.decoder(self._pull(path))
+
+        endpoint = endpoint_template(path)
+        self._local.endpoint = endpoint
+        content = self._pull(path)
+        started = perf_counter()
+        json = self.decoder(content)
+        self.instrumentation.on_decode(endpoint, perf_counter() - started, len(content))
+        return json
+
+    def _model_class(self, model_class): #returns the class this parser builds in place of model_class
+        if self.compact_models:
+            return COMPACT_MODELS.get(model_class, model_class)
+        return model_class
+
+    def _build_list(self, model_class, json_list, fields = None): #builds model_class objects, taking them from the identity map when it tracks model_class.  With fields, the json is projected first, and the partial objects are kept out of the identity map
+        if fields is not None:
+            return [model_class(raw_json) for raw_json in project(json_list, fields)]
+        if self.identity_map is not None and model_class in self.identity_map.model_classes:
+            return self.identity_map.intern_list(model_class, json_list)
+        return [model_class(raw_json) for raw_json in json_list]
+
+    def _model(self, model_class, raw_json): #builds a single model object from raw json
+        model_class = self._model_class(model_class)
+        if self.instrumentation is None:
+            return self._build_list(model_class, [raw_json])[0]
+
+        started = perf_counter()
+        model = self._build_list(model_class, [raw_json])[0]
+        self.instrumentation.on_build(getattr(self._local, 'endpoint', None), model_class.__name__, 1, perf_counter() - started)
+        return model
+
+    def _model_list(self, model_class, json_list, fields = None): #builds a list of model objects from a raw json list.  fields, if given, lists the only fields to keep; the others are set to None
+        model_class = self._model_class(model_class)
+        if self.instrumentation is None:
+            return self._build_list(model_class, json_list, fields)
+
+        started = perf_counter()
+        model_list = self._build_list(model_class, json_list, fields)
+        self.instrumentation.on_build(getattr(self._local, 'endpoint', None), model_class.__name__, len(model_list), perf_counter() - started)
+        return model_list
+
+    def __pull_team_list_by_page(self, page): #Helper function to make code for get_team_list simpler.
+        json_list = self._pull_json("/teams/" + str(page))
+        team_list = self._model_list(TBATeam, json_list)
+
+        return team_list
+
+    def iter_team_list(self, workers = 4, max_pages = 100): #Generator that yields every FRC team's TBATeam object, page by page, as the pages arrive.  Up to workers pages are requested ahead in parallel, and no new pages are requested once an empty page has been seen
+        executor = ThreadPoolExecutor(max_workers = workers)
+        pending = {} #page number -> future for pages that have been requested but not yet yielded
+        last_page = [max_pages] #pages at or past this are never requested.  Lowered by whichever worker first sees an empty page
+
+        def pull_page(page):
+            partial_list = self.__pull_team_list_by_page(page)
+            if not partial_list:
+                last_page[0] = min(last_page[0], page)
+            return partial_list
+
+        next_page = 0
+        try:
+            while next_page < min(workers, max_pages):
+                pending[next_page] = executor.submit(pull_page, next_page)
+                next_page += 1
+
+            page = 0
+            while page in pending:
+                partial_list = pending.pop(page).result()
+                if not partial_list:
+                    break #kill loop once we hit NULL data
+
+                if next_page < last_page[0]:
+                    pending[next_page] = executor.submit(pull_page, next_page)
+                    next_page += 1
+
+                for team in partial_list:
+                    yield team
+                page += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait = False)
+
+    def get_team_list(self, page = None, workers = 4): #get list of FRC teams' TBATeam objects, either the entire list, or by page #.  The entire list is crawled with iter_team_list
+        if not page is None:
+            team_list = self.__pull_team_list_by_page(page)
+        else:
+            team_list = list(self.iter_team_list(workers)) #Allows for significant team-expansion (up to 100 pages).  At that point in time, we will probably be on APIv3 or more.
+
+        return team_list
+
+    def get_team(self, team_key): #get a team's TBATeam object
+        json = self._pull_json("/team/" + team_key)
+        team_object = self._model(TBATeam, json)
+
+        return team_object
+
+    def __pull_team_events(self, team_key, year): #helper function to pull team events for use in get_team_events with a year passed in
+        json = self._pull_json("/team/" + team_key + "/" + str(year) + "/events")
+        event_list = self._model_list(TBAEvent, json)
+
+        return event_list
+
+    def __pull_all_team_events(self, team_key): #helper function to pull team events for use in get_team_events without a year passed in
+        json = self._pull_json("/team/" + team_key + "/history/events")
+        event_list = self._model_list(TBAEvent, json)
+
+        return event_list
+
+    def get_team_events(self, team_key, year=None): #Get a list of event objects that a given team has competed in
+        if not year is None:
+            event_list = self.__pull_team_events(team_key, year)
+        else:
+            event_list = self.__pull_all_team_events(team_key)
+        return event_list
+
+    def get_team_event_awards(self, team_key, event_key): #Get a list of all award objects that a team has won at a given event
+        json = self._pull_json("/team/" + team_key + "/event/" + event_key + "/awards")
+        award_list = self._model_list(TBAAward, json)
+
+        return award_list
+
+    def get_team_event_matches(self, team_key, event_key, fields = None): #Get a list of all match objects that a team competed in at a given event.  fields, if given, lists the only fields to keep, for example ('key', 'alliances'); the rest are None
+        json = self._pull_json("/team/" + team_key + "/event/" + event_key + "/matches")
+        match_list = self._model_list(TBAMatch, json, fields)
+
+        return match_list
+
+    def get_team_years_participated(self, team_key): #Get a list of years participated
+        years_participated = self._pull_json("/team/" + team_key + "/years_participated")
+
+        return years_participated
+
+    def __pull_team_media(self, team_key, year): #pulls team media for use in get_team_media
+        json = self._pull_json("/team/" + team_key + "/" + str(year) + "/media")
+        media_list = self._model_list(TBAMedia, json)
+
+        return media_list
+
+    def get_team_media(self, team_key, year = None, workers = None): #Get a list of all media objects a team is responsible for.  Without a year, every year the team participated in is requested in parallel on up to workers threads (default max_concurrency)
+        if not year is None:
+            media_list = self.__pull_team_media(team_key, year)
+        else:
+            media_list = []
+
+            for partial_list in self.__pull_team_media_by_year(team_key, self.get_team_years_participated(team_key), workers).values():
+                media_list.extend(partial_list)
+
+        return media_list
+
+    def __pull_team_media_by_year(self, team_key, years, workers = None, executor = None): #pulls media for every year in years in parallel.  Returns {year: [TBAMedia]} in the order of years.  Uses executor if one is given
+        if not years:
+            return {}
+        if executor is None:
+            with ThreadPoolExecutor(max_workers = min(workers or self.max_concurrency, len(years))) as executor:
+                return self.__pull_team_media_by_year(team_key, years, executor = executor)
+
+        futures = [(year, executor.submit(self.__pull_team_media, team_key, year)) for year in years]
+        return OrderedDict((year, future.result()) for year, future in futures)
+
+    def get_team_profile(self, team_key, media = True, workers = None): #Returns a TBATeamProfile holding everything TBA knows about a team.  Every request is made in parallel on up to workers threads (default max_concurrency), with the per-year media requests started as soon as the years participated are known
+        with ThreadPoolExecutor(max_workers = workers or self.max_concurrency) as executor:
+            team = executor.submit(self.get_team, team_key)
+            events = executor.submit(self.get_team_history_events, team_key)
+            awards = executor.submit(self.get_team_history_awards, team_key)
+            robots = executor.submit(self.get_team_history_robots, team_key)
+            districts = executor.submit(self.get_team_history_districts, team_key)
+            years = self.get_team_years_participated(team_key)
+
+            media_by_year = self.__pull_team_media_by_year(team_key, years, executor = executor) if media else {}
+
+            return TBATeamProfile(team.result(), years, events.result(), awards.result(), robots.result(), districts.result(), media_by_year)
+
+    def get_team_history_events(self, team_key): #Returns a list of all event objects a team has attended
+        events_list = self.__pull_all_team_events(team_key)
+        return events_list
+
+    def get_team_history_awards(self, team_key): #Returns a list of all award objects a team has won
+        json = self._pull_json("/team/" + team_key + "/history/awards")
+        award_list = self._model_list(TBAAward, json)
+
+        return award_list
+
+    def get_team_history_robots(self, team_key): #Returns a list off all robot objects a team has made (seems to only work 2015 onwards)
+        json = self._pull_json("/team/" + team_key + "/history/robots")
+
+        robo_container_obj = TBARobotGroup(json, self._model_class(TBARobot))
+
+        return robo_container_obj
+
+    def get_team_history_districts(self, team_key): #gets a list of districts a team has participated in by year
+        team_history_districts = self._pull_json("/team/" + team_key + "/history/districts")
+
+        return team_history_districts
+
+    def calc_team_key(self, number): #Calculates a team's key given their team number
+        key = "frc" + str(number)
+        return key
+
+    def get_event_list(self, year, fields = None): #Returns a list of all event objects for a given year.  See get_event_matches for fields
+        json = self._pull_json("/events/" + str(year))
+        event_list = self._model_list(TBAEvent, json, fields)
+
+        return event_list
+
+    def get_event(self, event_key): #Returns a single event object given an event key
+        json = self._pull_json("/event/" + event_key)
+
+        event_obj = self._model(TBAEvent, json)
+
+        return event_obj
+
+    def get_event_teams(self, event_key, fields = None): #Returns a list of all team objects that attended an event.  See get_event_matches for fields
+        json = self._pull_json("/event/" + event_key + "/teams")
+
+        team_list = self._model_list(TBATeam, json, fields)
+
+        return team_list
+
+    def get_event_matches(self, event_key, fields = None): #Returns a list of all match objects in a given event.  fields, if given, lists the only fields to keep, for example ('key', 'alliances'); the rest are None, so large values such as score_breakdown are never held
+        json = self._pull_json("/event/" + event_key + "/matches")
+
+        match_list = self._model_list(TBAMatch, json, fields)
+
+        return match_list
+
+    def get_event_stats(self, event_key):
+        json = self._pull_json("/event/" + event_key + "/stats")
+
+        event_stats = self._model(TBAEventStats, json)
+
+        return event_stats
+
+    def calc_event_stats(self, event_key, comp_levels = ('qm',), components = True): #Computes OPR, DPR, CCWM and component OPRs locally from the event's matches, for events where get_event_stats lags or is missing.  Returns a TBAEventStats
+        from .stats import TBAStatsEngine #imported here so that only code computing stats pays for loading numpy
+        engine = TBAStatsEngine(self.get_event_matches(event_key), comp_levels, components)
+        return engine.stats()
+
+    def get_event_rankings(self, event_key):
+        json = self._pull_json("/event/" + event_key + "/rankings")
+
+        event_rankings = self._model(TBAEventRankings, json)
+
+        return event_rankings
+
+    def get_event_awards(self, event_key): #Returns a list of all award objects given out at an event
+        json = self._pull_json("/event/" + event_key + "/awards")
+
+        award_list = self._model_list(TBAAward, json)
+
+        return award_list
+
+    def get_event_district_points(self, event_key): #returns a TBADistrictPoints obj, capable of method chaining
+        json = self._pull_json("/event/" + event_key + "/district_points")
+
+        district_points_obj = self._model(TBADistrictPoints, json)
+
+        return district_points_obj
+
+    def get_event_index(self, year, refresh = False): #Returns the TBAEventIndex of a year's events.  The event list is only downloaded the first time a year is used, or when refresh is set
+        year = str(year)
+        with self._event_index_lock:
+            event_index = self._event_indexes.get(year)
+        if event_index is None or refresh:
+            event_index = TBAEventIndex(self._pull_json("/events/" + year))
+            with self._event_index_lock:
+                self._event_indexes[year] = event_index
+        return event_index
+
+    #Calculates event key from both year and event nickname.
+    #Name variable does not have to be complete, but it must be specific enough to specify a single event.  Case is ignored
+    #Returns "0" is no events are found, "1" if more than one event is found, and event key otherwise.
+    #ALL RETURNS ARE STRINGS.  Use find_event_keys to get every matching event instead
+    #Based on method from https://github.com/Alexanders101/The-Blue-Alliance-Python-API/
+    def calc_event_key(self, year, name):
+        return self.get_event_index(year).calc_event_key(name)
+
+    def find_event_keys(self, year, name): #Returns a list of the keys of every event in a year whose short name or full name starts with name, ignoring case
+        return self.get_event_index(year).find(name)
+
+    def calc_event_keys(self, year, names): #Resolves many event names at once.  Returns {name: [event keys]} like find_event_keys
+        return self.get_event_index(year).find_many(names)
+
+    def get_match(self, match_key): #Returns a single match object given the match key
+        json = self._pull_json("/match/" + match_key)
+
+        match_obj = self._model(TBAMatch, json)
+
+        return match_obj
+
+    #Calculates match key from event key, competition level, match number, and, if needed, set number
+    #Event key can be calculated using calc_event_key()
+    #Comp level must be string: "q" for qualifying matches, "ef" for eighth final, "qf" for quarterfinal,
+    #                           "sf" for semifinal or "f" for final
+    #Match number is the standard match number. In elims, count restarts at 1 for every new set
+    #Set number must be included for all requests except quals matches. This must even be included for finals, although it will always be 1
+    def calc_match_key(self, event_key, comp_level, match_number, set_number = None):
+        if not set_number == None:
+            key = event_key + '_' + comp_level + str(set_number) + 'm' + str(match_number)
+        else:
+            key = event_key + '_' + comp_level + 'm' + str(match_number)
+        return key
+
+    def get_match_index(self, event_keys, workers = None, index = None): #Requests the matches of every event in event_keys concurrently and returns them in a TBAMatchIndex, or adds them to index if one is given.  Raises the first error hit, after adding every event that succeeded
+        matches = self.get_event_matches_batch(event_keys, workers)
+        if index is None:
+            index = TBAMatchIndex()
+        for match_list in matches.succeeded().values():
+            index.add(match_list)
+        for error in matches.errors.values():
+            raise error
+        return index
+
+    def get_district_list(self, year):
+        district_list = self._pull_json("/districts/" + str(year))
+
+        return district_list
+
+    def get_district_events(self, district_key, year, fields = None): #Returns a list of event objects in a specific district.  See get_event_matches for fields
+        json = self._pull_json("/district/" + district_key + "/" + str(year) + "/events")
+
+        event_list = self._model_list(TBAEvent, json, fields)
+
+        return event_list
+
+    def get_district_teams(self, district_key, year, fields = None): #Returns a list of team objects in a specific district.  See get_event_matches for fields
+        json = self._pull_json("/district/" + district_key + "/" + str(year) + "/teams")
+
+        team_list = self._model_list(TBATeam, json, fields)
+
+        return team_list
+
+    def get_district_standings(self, district_key, year, workers = None, events_counted = 2, championship_multiplier = 1, championship_keys = None): #Requests the district points of every event in a district concurrently and returns a TBADistrictStandings.  District championships and their divisions (event_type 2 and 5, or the events in championship_keys if it is given) are counted, times championship_multiplier, on top of each team's best events_counted events.  Raises the first error hit
+        from .district import TBADistrictStandings, CHAMPIONSHIP_EVENT_TYPES #imported here so that only code ranking districts pays for loading numpy
+        events = self.get_district_events(district_key, year)
+        points = self.get_event_district_points_batch([event.key for event in events], workers)
+        for error in points.errors.values():
+            raise error
+
+        if championship_keys is None:
+            championship_keys = set(event.key for event in events if event.event_type in CHAMPIONSHIP_EVENT_TYPES)
+        return TBADistrictStandings(events_counted, championship_multiplier).add_events(points, championship_keys)
+
+    #Batch methods.  Each takes an iterable of keys, requests every distinct key on up to workers threads (default max_concurrency), and returns a TBABatchResult mapping key -> result in the order given.  A failed key maps to None and its exception is kept in result.errors instead of aborting the batch
+    def get_batch(self, method, keys, workers = None): #method is any single key get_* method of this parser, for example parser.get_event_matches
+        if workers is None:
+            workers = self.max_concurrency
+        return run_batch(method, keys, workers)
+
+    def get_team_batch(self, team_keys, workers = None):
+        return self.get_batch(self.get_team, team_keys, workers)
+
+    def get_team_events_batch(self, team_keys, workers = None):
+        return self.get_batch(self.get_team_events, team_keys, workers)
+
+    def get_team_history_awards_batch(self, team_keys, workers = None):
+        return self.get_batch(self.get_team_history_awards, team_keys, workers)
+
+    def get_event_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event, event_keys, workers)
+
+    def get_event_teams_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event_teams, event_keys, workers)
+
+    def get_event_matches_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event_matches, event_keys, workers)
+
+    def get_event_stats_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event_stats, event_keys, workers)
+
+    def get_event_rankings_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event_rankings, event_keys, workers)
+
+    def get_event_awards_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event_awards, event_keys, workers)
+
+    def get_event_district_points_batch(self, event_keys, workers = None):
+        return self.get_batch(self.get_event_district_points, event_keys, workers)
+
+    def get_match_batch(self, match_keys, workers = None):
+        return self.get_batch(self.get_match, match_keys, workers)
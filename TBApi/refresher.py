@@ -0,0 +1,181 @@
+#TBApi - stale-while-revalidate refresher that keeps the responses of hot TBAParser requests up to date on a background thread
+
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .cache import TBAMemoryCache
+from .instrument import endpoint_template
+
+#Endpoints registered for an event by TBARefresher.register_event
+EVENT_PATHS = ('/rankings', '/matches', '/stats', '/district_points')
+
+#State kept for one hot path
+class _TBAHotPath:
+    def __init__(self, now):
+        self.body = None #last good response body, or None until the first one arrives
+        self.fetched_at = None #monotonic time body was downloaded
+        self.last_used = now #monotonic time a caller last asked for the path
+        self.due = now #monotonic time of the next background refresh
+        self.errors = 0 #background refreshes that have failed in a row
+
+#Class that serves registered hot paths of a parser from the last good response, while a background thread refreshes each one every interval seconds (+/- jitter, as a fraction of interval, so refreshes do not line up).  A body older than max_stale is never served; the caller waits for a normal request instead.  Paths not asked for in idle_timeout seconds are demoted and no longer refreshed, until they are asked for again
+#Creating a TBARefresher attaches it to parser, so every get_* method that uses a registered path is answered by it.  Refreshes are conditional requests made through the refresher's own cache (a TBAMemoryCache unless cache is given); the parser's cache is left as it is, and still serves every path that is not hot
+class TBARefresher:
+    def __init__(self, parser, interval = 10.0, jitter = 0.2, max_stale = 60.0, idle_timeout = 300.0, workers = 4, cache = None):
+        self.parser = parser
+        self.interval = interval
+        self.jitter = jitter
+        self.max_stale = max_stale
+        self.idle_timeout = idle_timeout
+        self.workers = workers
+        self.cache = cache if cache is not None else TBAMemoryCache() #last body of every hot path, for revalidation
+        self.hits = 0 #requests answered from a hot body
+        self.misses = 0 #requests for hot paths that had to wait for TBA
+        self.refreshes = 0 #background refreshes made
+        self.refresh_errors = 0 #background refreshes that failed.  The last good body keeps being served until it is max_stale
+        self.demotions = 0 #paths demoted for going unused
+
+        self._paths = {} #path -> _TBAHotPath
+        self._demoted = set() #paths that were demoted, and are promoted again when next asked for
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        parser.refresher = self
+
+    def __next_due(self, now, errors): #jittered time of the next refresh.  Failed refreshes back off, but never past max_stale
+        delay = self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        if errors:
+            delay = min(delay * 2 ** errors, self.max_stale)
+        return now + delay
+
+    def register(self, path): #makes path (relative to the parser's baseURL, as in '/event/2016casj/rankings') hot.  Its first body is downloaded on the next background pass, or by the first request for it
+        with self._lock:
+            if path not in self._paths:
+                self._paths[path] = _TBAHotPath(time.monotonic())
+            self._demoted.discard(path)
+        self._wake.set()
+
+    def register_event(self, event_key, paths = EVENT_PATHS): #registers an event's rankings, matches, stats and district points
+        for path in paths:
+            self.register('/event/' + event_key + path)
+
+    def unregister(self, path):
+        with self._lock:
+            self._paths.pop(path, None)
+            self._demoted.discard(path)
+
+    def hot_paths(self):
+        with self._lock:
+            return sorted(self._paths)
+
+    def pull(self, path): #called by TBAParser._pull for every request.  Returns the hot body for path if there is one fresh enough, and otherwise makes the request through the parser
+        now = time.monotonic()
+        with self._lock:
+            if path in self._demoted:
+                self._demoted.discard(path)
+                self._paths[path] = _TBAHotPath(now)
+            hot = self._paths.get(path)
+            if hot is not None:
+                hot.last_used = now
+                if hot.body is not None and now - hot.fetched_at <= self.max_stale:
+                    self.hits += 1
+                    body = hot.body
+                else:
+                    self.misses += 1
+                    body = None
+
+        if hot is None:
+            return self.parser._pull(path, refresh = True)
+
+        if body is not None:
+            if self.parser.instrumentation is not None:
+                self.parser.instrumentation.on_cache(endpoint_template(path), 'refreshed')
+            return body
+
+        body = self.parser._pull(path, refresh = True, cache = self.cache)
+        self.__store(path, body)
+        return body
+
+    def __store(self, path, body):
+        now = time.monotonic()
+        with self._lock:
+            hot = self._paths.get(path)
+            if hot is not None:
+                hot.body = body
+                hot.fetched_at = now
+                hot.errors = 0
+                hot.due = self.__next_due(now, 0)
+
+    def __refresh(self, path):
+        try:
+            body = self.parser._pull(path, refresh = True, cache = self.cache)
+        except Exception:
+            now = time.monotonic()
+            with self._lock:
+                self.refresh_errors += 1
+                hot = self._paths.get(path)
+                if hot is not None:
+                    hot.errors += 1
+                    hot.due = self.__next_due(now, hot.errors)
+            return
+        with self._lock:
+            self.refreshes += 1
+        self.__store(path, body)
+
+    def refresh_due(self): #demotes idle paths, refreshes every path that is due, and returns the seconds until the next one is due.  Called by the background thread, but can be called directly instead of using start()
+        now = time.monotonic()
+        with self._lock:
+            for path, hot in list(self._paths.items()):
+                if now - hot.last_used > self.idle_timeout:
+                    del self._paths[path]
+                    self._demoted.add(path)
+                    self.demotions += 1
+            due = [path for path, hot in self._paths.items() if hot.due <= now]
+            for path in due:
+                self._paths[path].due = float('inf') #not picked again while this refresh is running
+
+        if due:
+            with ThreadPoolExecutor(max_workers = max(1, min(self.workers, len(due)))) as executor:
+                list(executor.map(self.__refresh, due))
+
+        with self._lock:
+            if not self._paths:
+                return self.interval
+            return max(0.0, min(hot.due for hot in self._paths.values()) - time.monotonic())
+
+    def __run(self):
+        while not self._stop.is_set():
+            wait = self.refresh_due()
+            self._wake.wait(min(wait, self.idle_timeout))
+            self._wake.clear()
+
+    def start(self): #starts the background thread.  Returns self so it can be chained on the constructor
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target = self.__run, name = 'TBARefresher')
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self): #stops the background thread and detaches the refresher from its parser
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.parser.refresher is self:
+            self.parser.refresher = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def stats(self): #returns the refresher counters as a dictionary
+        with self._lock:
+            hot = len(self._paths)
+        return {'hits': self.hits, 'misses': self.misses, 'refreshes': self.refreshes, 'refresh_errors': self.refresh_errors, 'demotions': self.demotions, 'hot': hot}
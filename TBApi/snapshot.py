@@ -0,0 +1,231 @@
+#TBApi - offline season snapshots.  Stores a year's event, team, match and district responses in a local SQLite database, along with indexed tables of the data in them, and replays the responses to TBAParser with no network
+
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from .transport import TBAResponse
+from .errors import TBAError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (path TEXT PRIMARY KEY, body BLOB NOT NULL, fetched_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS events (key TEXT PRIMARY KEY, year INTEGER, name TEXT, short_name TEXT, event_type INTEGER, event_district INTEGER, start_date TEXT, end_date TEXT);
+CREATE TABLE IF NOT EXISTS teams (key TEXT PRIMARY KEY, team_number INTEGER, nickname TEXT, rookie_year INTEGER, country_name TEXT, region TEXT);
+CREATE TABLE IF NOT EXISTS event_teams (event_key TEXT, team_key TEXT, PRIMARY KEY (event_key, team_key));
+CREATE TABLE IF NOT EXISTS matches (key TEXT PRIMARY KEY, event_key TEXT, comp_level TEXT, set_number INTEGER, match_number INTEGER, time INTEGER, red_score INTEGER, blue_score INTEGER);
+CREATE TABLE IF NOT EXISTS match_teams (match_key TEXT, team_key TEXT, alliance TEXT, PRIMARY KEY (match_key, team_key));
+CREATE TABLE IF NOT EXISTS rankings (event_key TEXT, team_key TEXT, rank INTEGER, row TEXT, PRIMARY KEY (event_key, team_key));
+CREATE TABLE IF NOT EXISTS stats (event_key TEXT, team_key TEXT, opr REAL, dpr REAL, ccwm REAL, PRIMARY KEY (event_key, team_key));
+CREATE TABLE IF NOT EXISTS awards (event_key TEXT, award_type INTEGER, name TEXT, year INTEGER, team_key TEXT, awardee TEXT);
+CREATE TABLE IF NOT EXISTS district_points (event_key TEXT, team_key TEXT, total INTEGER, qual_points INTEGER, elim_points INTEGER, alliance_points INTEGER, award_points INTEGER, PRIMARY KEY (event_key, team_key));
+CREATE INDEX IF NOT EXISTS events_year ON events (year);
+CREATE INDEX IF NOT EXISTS event_teams_team ON event_teams (team_key);
+CREATE INDEX IF NOT EXISTS matches_event ON matches (event_key);
+CREATE INDEX IF NOT EXISTS match_teams_team ON match_teams (team_key);
+CREATE INDEX IF NOT EXISTS rankings_team ON rankings (team_key);
+CREATE INDEX IF NOT EXISTS stats_team ON stats (team_key);
+CREATE INDEX IF NOT EXISTS awards_event ON awards (event_key);
+CREATE INDEX IF NOT EXISTS awards_team ON awards (team_key);
+CREATE INDEX IF NOT EXISTS district_points_team ON district_points (team_key);
+"""
+
+#Endpoints stored for every event by snapshot_year, as (path suffix, TBASnapshotStore method that indexes the response)
+EVENT_ENDPOINTS = [('teams', 'index_event_teams'), ('matches', 'index_matches'), ('rankings', 'index_rankings'),
+                   ('stats', 'index_stats'), ('awards', 'index_awards'), ('district_points', 'index_district_points')]
+
+#Class that holds a season snapshot in a SQLite database at path.  The raw responses table is what TBAReplayTransport answers from; the other tables hold the same data split into indexed rows, for querying directly with execute
+class TBASnapshotStore:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        self._lock = threading.Lock()
+        self._batching = False
+        with self._lock:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def execute(self, sql, parameters = ()): #runs a query against the snapshot and returns every row
+        with self._lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def __write(self, sql, rows): #inserts or replaces rows, committing straight away unless inside batch()
+        with self._lock:
+            self.connection.executemany(sql, rows)
+            if not self._batching:
+                self.connection.commit()
+
+    @contextmanager
+    def batch(self): #groups every write made inside the with block into one commit, so SQLite syncs to disk once instead of once per write
+        self._batching = True
+        try:
+            yield self
+        finally:
+            self._batching = False
+            with self._lock:
+                self.connection.commit()
+
+    def store_response(self, path, body): #stores a raw response body for path (relative to TBAParser.baseURL)
+        self.store_responses([(path, body)])
+
+    def store_responses(self, responses): #stores (path, body) pairs with a single statement.  Bodies that are not bytes are encoded as json
+        now = time.time()
+        self.__write("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                     [(path, sqlite3.Binary(body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')), now) for path, body in responses])
+
+    def get_response(self, path): #returns the stored body for path, or None
+        rows = self.execute("SELECT body FROM responses WHERE path = ?", (path,))
+        if not rows:
+            return None
+        return bytes(rows[0][0])
+
+    def paths(self):
+        return [row[0] for row in self.execute("SELECT path FROM responses ORDER BY path")]
+
+    def index_events(self, json_list):
+        self.__write("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     [(event['key'], event['year'], event['name'], event['short_name'], event['event_type'], event['event_district'], event['start_date'], event['end_date']) for event in json_list])
+
+    def index_event_teams(self, event_key, json_list):
+        self.__write("INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?, ?, ?)",
+                     [(team['key'], team['team_number'], team['nickname'], team['rookie_year'], team['country_name'], team['region']) for team in json_list])
+        self.__write("INSERT OR REPLACE INTO event_teams VALUES (?, ?)", [(event_key, team['key']) for team in json_list])
+
+    def index_matches(self, event_key, json_list):
+        self.__write("INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     [(match['key'], match['event_key'], match['comp_level'], match['set_number'], match['match_number'], match['time'],
+                       match['alliances']['red']['score'], match['alliances']['blue']['score']) for match in json_list])
+        self.__write("INSERT OR REPLACE INTO match_teams VALUES (?, ?, ?)",
+                     [(match['key'], team_key, color) for match in json_list for color in ('red', 'blue') for team_key in match['alliances'][color]['teams'] if team_key])
+
+    def index_rankings(self, event_key, json_list):
+        if not json_list:
+            return
+        self.__write("INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?)",
+                     [(event_key, 'frc' + str(row[1]), row[0], json.dumps(dict(zip(json_list[0], row)))) for row in json_list[1:]])
+
+    def index_stats(self, event_key, json):
+        if not json:
+            return
+        oprs, dprs, ccwms = json.get('oprs') or {}, json.get('dprs') or {}, json.get('ccwms') or {}
+        self.__write("INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?, ?)",
+                     [(event_key, 'frc' + team_number, oprs.get(team_number), dprs.get(team_number), ccwms.get(team_number)) for team_number in oprs])
+
+    def index_awards(self, event_key, json_list): #awards have no natural key, so the event's old rows are deleted first to keep re-snapshots from duplicating them
+        self.__write("DELETE FROM awards WHERE event_key = ?", [(event_key,)])
+        self.__write("INSERT INTO awards VALUES (?, ?, ?, ?, ?, ?)",
+                     [(event_key, award['award_type'], award['name'], award['year'],
+                       'frc' + str(recipient['team_number']) if recipient.get('team_number') else None, recipient.get('awardee'))
+                      for award in json_list for recipient in (award['recipient_list'] or [{}])])
+
+    def index_district_points(self, event_key, json):
+        if not json or not json.get('points'):
+            return
+        self.__write("INSERT OR REPLACE INTO district_points VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     [(event_key, team_key, points['total'], points['qual_points'], points['elim_points'], points['alliance_points'], points['award_points'])
+                      for team_key, points in json['points'].items()])
+
+    def parser(self, team_number, package_name, version_number, **kwargs): #Returns a TBAParser that answers its requests from this snapshot.  See snapshot_year for which get_* methods can be replayed
+        from .parser import TBAParser
+        return TBAParser(team_number, package_name, version_number, transport = TBAReplayTransport(self), **kwargs)
+
+#Transport that answers TBAParser's requests from a TBASnapshotStore instead of the network.  Paths that were never stored get a 404, which TBAParser raises as a TBAError
+class TBAReplayTransport:
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, url, headers = None):
+        path = url.split('/api/v2', 1)[-1] #stored paths are relative to TBAParser.baseURL
+        body = self.store.get_response(path)
+        if body is None:
+            return TBAResponse(404, {}, b'{"404": "Not in snapshot"}')
+        return TBAResponse(200, {'Content-Type': 'application/json'}, body)
+
+    def close(self):
+        pass
+
+#Event endpoints that are also split into a /team/{team_key}/event/{event_key}/... response for every team at the event
+TEAM_EVENT_ENDPOINTS = ('matches', 'awards')
+
+def team_event_responses(event_key, endpoint, json_list, team_keys): #splits an event's matches or awards into the responses TBA would give each of team_keys, which are empty lists for teams with none
+    by_team = dict((team_key, []) for team_key in team_keys)
+    for item in json_list:
+        if endpoint == 'matches':
+            team_keys = [team_key for color in ('red', 'blue') for team_key in item['alliances'][color]['teams'] if team_key]
+        else:
+            team_keys = ['frc' + str(recipient['team_number']) for recipient in (item['recipient_list'] or []) if recipient.get('team_number')]
+        for team_key in set(team_keys):
+            by_team.setdefault(team_key, []).append(item)
+    return [("/team/" + team_key + "/event/" + event_key + "/" + endpoint, items) for team_key, items in by_team.items()]
+
+#Downloads a year into store using parser, so that a parser from store.parser can answer these methods offline:
+#get_event_list, get_event, get_event_teams, get_event_matches, get_event_stats, get_event_rankings, get_event_awards and get_event_district_points for every event of the year;
+#get_team, get_team_events(team_key, year), get_team_event_matches and get_team_event_awards for every team at those events; get_match for every match;
+#get_district_list, get_district_events and get_district_teams for the year, and everything built on them (calc_event_key, get_match_index, calc_event_stats, get_district_standings, ...)
+#Anything else (get_team_list, team history, media and years participated, other years) is not stored, and raises TBAError (404) offline.  The per-team responses are built from the event responses rather than requested.  Event requests are made on up to workers threads (default parser.max_concurrency), and each event is written in one commit
+def snapshot_year(parser, year, store, workers = None):
+    year = str(year)
+    events_path = "/events/" + year
+    events_body = parser._pull(events_path)
+    events = json.loads(events_body)
+    with store.batch():
+        store.store_response(events_path, events_body)
+        store.index_events(events)
+        store.store_responses([("/event/" + event['key'], event) for event in events])
+
+    team_events = {} #team key -> events the team attended, for /team/{key}/{year}/events
+    with ThreadPoolExecutor(max_workers = workers or parser.max_concurrency) as executor:
+        futures = [(event, [(endpoint, index_method, executor.submit(parser._pull, "/event/" + event['key'] + "/" + endpoint)) for endpoint, index_method in EVENT_ENDPOINTS])
+                   for event in events]
+
+        for event, event_futures in futures:
+            event_key = event['key']
+            responses = []
+            team_keys = []
+            with store.batch():
+                for endpoint, index_method, future in event_futures:
+                    body = future.result()
+                    responses.append(("/event/" + event_key + "/" + endpoint, body))
+                    json_data = json.loads(body)
+                    getattr(store, index_method)(event_key, json_data)
+
+                    if endpoint == 'teams':
+                        responses.extend(("/team/" + team['key'], team) for team in json_data)
+                        for team in json_data:
+                            team_keys.append(team['key'])
+                            team_events.setdefault(team['key'], []).append(event)
+                    elif endpoint == 'matches':
+                        responses.extend(("/match/" + match['key'], match) for match in json_data)
+                    if endpoint in TEAM_EVENT_ENDPOINTS:
+                        responses.extend(team_event_responses(event_key, endpoint, json_data, team_keys))
+                store.store_responses(responses)
+
+    with store.batch():
+        store.store_responses([("/team/" + team_key + "/" + year + "/events", attended) for team_key, attended in team_events.items()])
+        snapshot_districts(parser, year, store)
+
+    return store
+
+def snapshot_districts(parser, year, store): #stores the year's district list and each district's events and teams
+    districts_path = "/districts/" + year
+    try:
+        districts_body = parser._pull(districts_path)
+    except TBAError as error:
+        if error.status_code != 404: #years before districts existed have no list
+            raise
+        districts_body = b'[]'
+    store.store_response(districts_path, districts_body)
+
+    for district in json.loads(districts_body):
+        for endpoint in ('events', 'teams'):
+            path = "/district/" + district['key'] + "/" + year + "/" + endpoint
+            store.store_response(path, parser._pull(path))
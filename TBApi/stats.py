@@ -0,0 +1,126 @@
+#TBApi - local OPR / DPR / CCWM engine, computed from match results instead of TBA's /event/{key}/stats
+
+import numpy as np
+from .models import TBAEventStats, TBAEventStatsCategory
+from .export import raw_json, flatten_breakdown
+
+#Class that computes least squares team contributions from match results.  Each played alliance appearance adds a row to the team-by-appearance matrix A, but only the running normal equations (A^T A and A^T b for every metric) are kept, so matches can be added or replaced one at a time and a solve costs one (teams x teams) least squares no matter how many matches have been seen
+#Metrics: 'opr' (own alliance score), 'dpr' (opposing alliance score), 'ccwm' (own minus opposing score), plus a component OPR for every numeric score_breakdown field when components is set
+class TBAStatsEngine:
+    def __init__(self, matches = None, comp_levels = ('qm',), components = True):
+        self.comp_levels = comp_levels #only matches at these comp levels are counted.  None counts every level
+        self.components = components
+        self.teams = [] #team keys in matrix column order
+        self.team_index = {} #team key -> matrix column
+        self.metrics = ['opr', 'dpr', 'ccwm'] #rhs column order
+        self.metric_index = {'opr': 0, 'dpr': 1, 'ccwm': 2}
+        self._ata = np.zeros((0, 0))
+        self._atb = np.zeros((0, 3))
+        self._contributions = {} #match key -> rows added for it, so a changed match can be taken back out
+        self._solution = None
+
+        if matches is not None:
+            self.add_matches(matches)
+
+    def __grow(self, team_keys, metric_names): #adds matrix columns for new teams and rhs columns for new metrics
+        new_teams = []
+        for team_key in team_keys:
+            if team_key not in self.team_index:
+                self.team_index[team_key] = len(self.teams)
+                self.teams.append(team_key)
+                new_teams.append(team_key)
+        if new_teams:
+            self._ata = np.pad(self._ata, ((0, len(new_teams)), (0, len(new_teams))), 'constant')
+            self._atb = np.pad(self._atb, ((0, len(new_teams)), (0, 0)), 'constant')
+
+        new_metrics = []
+        for name in metric_names: #both alliances name the same breakdown fields, so each new name is only added once
+            if name not in self.metric_index:
+                self.metric_index[name] = len(self.metrics)
+                self.metrics.append(name)
+                new_metrics.append(name)
+        if new_metrics:
+            self._atb = np.pad(self._atb, ((0, 0), (0, len(new_metrics))), 'constant')
+
+    def __match_rows(self, raw): #returns [(team keys, {metric: value})] for both alliances of a played match, or [] if the match does not count
+        if self.comp_levels is not None and raw['comp_level'] not in self.comp_levels:
+            return []
+
+        alliances = raw['alliances']
+        red_score = alliances['red']['score']
+        blue_score = alliances['blue']['score']
+        if red_score is None or blue_score is None or red_score < 0 or blue_score < 0: #unplayed matches have a score of -1
+            return []
+
+        breakdown = raw.get('score_breakdown') or {}
+        rows = []
+        for color, own_score, opposing_score in (('red', red_score, blue_score), ('blue', blue_score, red_score)):
+            values = {'opr': own_score, 'dpr': opposing_score, 'ccwm': own_score - opposing_score}
+            if self.components and breakdown.get(color):
+                for name, value in flatten_breakdown(breakdown[color], color).items():
+                    values[name[len(color) + 1:]] = value
+            team_keys = [team_key for team_key in alliances[color]['teams'] if team_key]
+            rows.append((team_keys, values))
+        return rows
+
+    def __apply(self, rows, signs): #adds (sign 1) or removes (sign -1) alliance rows from the normal equations in one vectorized update
+        appearances = np.zeros((len(rows), len(self.teams)))
+        values = np.zeros((len(rows), len(self.metrics)))
+        for row_number, (team_keys, row_values) in enumerate(rows):
+            appearances[row_number, [self.team_index[team_key] for team_key in team_keys]] = 1
+            for name, value in row_values.items():
+                values[row_number, self.metric_index[name]] = value
+
+        weighted = appearances.T * np.asarray(signs, dtype = float)
+        self._ata += weighted.dot(appearances)
+        self._atb += weighted.dot(values)
+
+    def add_matches(self, matches): #adds TBAMatch objects (or raw match json).  A match that was already added is replaced, so re-adding a full, updated match list is safe
+        changed_rows = []
+        signs = []
+        for match in matches:
+            raw = raw_json(match)
+            rows = self.__match_rows(raw)
+
+            old_rows = self._contributions.pop(raw['key'], None)
+            if old_rows:
+                changed_rows.extend(old_rows)
+                signs.extend([-1] * len(old_rows))
+
+            if rows:
+                self.__grow([team_key for team_keys, values in rows for team_key in team_keys], [name for team_keys, values in rows for name in values])
+                self._contributions[raw['key']] = rows
+                changed_rows.extend(rows)
+                signs.extend([1] * len(rows))
+
+        if changed_rows:
+            self.__apply(changed_rows, signs)
+            self._solution = None
+
+    def solve(self): #returns a (teams x metrics) array of every team's contribution to every metric
+        if self._solution is None:
+            if not self.teams:
+                self._solution = np.zeros((0, len(self.metrics)))
+            else:
+                self._solution = np.linalg.lstsq(self._ata, self._atb, rcond = None)[0] #least squares keeps the solve defined while some teams have too few matches to be separated
+        return self._solution
+
+    def category(self, metric): #returns a TBAEventStatsCategory of {team number: value} for one metric
+        column = self.solve()[:, self.metric_index[metric]]
+        return TBAEventStatsCategory(dict((team_key[3:], float(value)) for team_key, value in zip(self.teams, column)))
+
+    def component_names(self): #returns the score_breakdown fields component OPRs are available for
+        return self.metrics[3:]
+
+    def stats(self): #returns a TBAEventStats with opr, dpr and ccwm set like TBA's, and a component OPR category for every score_breakdown field in components
+        raw = {}
+        for metric, raw_name in (('opr', 'oprs'), ('dpr', 'dprs'), ('ccwm', 'ccwms')):
+            raw[raw_name] = self.category(metric).raw
+
+        event_stats = TBAEventStats(raw)
+        event_stats.components = dict((name, self.category(name)) for name in self.component_names())
+        return event_stats
+
+#Computes a TBAEventStats for every event in a {event key: match list} dictionary. Returns {event key: TBAEventStats}
+def calc_season_stats(matches_by_event, comp_levels = ('qm',), components = True):
+    return dict((event_key, TBAStatsEngine(matches, comp_levels, components).stats()) for event_key, matches in matches_by_event.items())
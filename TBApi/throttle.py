@@ -0,0 +1,124 @@
+#TBApi - rate limiting, retry backoff and request coalescing used on TBAParser's request path
+
+import time
+import random
+import threading
+
+#Token bucket rate limiter.  Allows bursts of up to burst requests, then rate requests per second.  Callers that find the bucket empty reserve the next token and sleep until it is due
+class TBARateLimiter:
+    def __init__(self, rate = 10.0, burst = None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.acquired = 0 #total tokens handed out
+        self.delayed = 0 #number of acquires that had to sleep
+        self.waited = 0.0 #total seconds spent sleeping
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self): #blocks until a request may be made
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.waited += wait
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def stats(self):
+        return {'acquired': self.acquired, 'delayed': self.delayed, 'waited': self.waited}
+
+#Retry policy for throttled (429) and failed (5xx) responses.  Waits a random time between 0 and base * 2^attempt seconds (capped at cap), but never less than a Retry-After header asks for
+class TBABackoff:
+    retry_statuses = frozenset([429, 500, 502, 503, 504])
+
+    def __init__(self, retries = 3, base = 0.5, cap = 30.0):
+        self.retries = retries
+        self.base = base
+        self.cap = cap
+        self.retried = 0 #total retries made
+        self.waited = 0.0 #total seconds spent backing off
+        self._lock = threading.Lock()
+
+    def should_retry(self, response, attempt):
+        return response.status_code in self.retry_statuses and attempt < self.retries
+
+    def delay(self, response, attempt): #returns the seconds to wait before retry number attempt + 1, and counts them as waited
+        delay = random.uniform(0, min(self.cap, self.base * (2 ** attempt)))
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(self.cap, float(retry_after)))
+            except ValueError:
+                pass #HTTP-date form of Retry-After is not used by TBA
+
+        with self._lock:
+            self.retried += 1
+            self.waited += delay
+        return delay
+
+    def wait(self, response, attempt): #sleeps before retry number attempt + 1
+        time.sleep(self.delay(response, attempt))
+
+    def stats(self):
+        return {'retried': self.retried, 'waited': self.waited}
+
+#A request that is currently being made by one thread, which other threads asking for the same thing wait on
+class _TBAFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+#Single-flight request coalescer.  While a call for a key is in progress, any other thread calling do() with the same key waits for that call and shares its result instead of making its own
+class TBARequestCoalescer:
+    def __init__(self):
+        self.leaders = 0 #calls that were actually made
+        self.followers = 0 #calls that shared another thread's result
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _TBAFlight()
+                self._flights[key] = flight
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function(*args)
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self):
+        return {'leaders': self.leaders, 'followers': self.followers, 'in_flight': self.in_flight()}
@@ -0,0 +1,49 @@
+#TBApi - HTTP transport used by TBAParser for every request made to TBA
+
+#Minimal response object, for transports that do not return a requests.Response.  Has the status_code, headers and content attributes TBAParser and the TBApi caches use
+class TBAResponse:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+#Class that owns the pooled, keep-alive requests.Session used by a TBAParser.  Any object with get(url, headers) and close() methods can be handed to TBAParser in its place
+class TBATransport:
+    def __init__(self, pool_size = 10, retries = 3, backoff_factor = 0.5, keep_alive = True, timeout = 30):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+        import requests #imported here so that importing TBApi does not load requests until a parser is actually created
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry_policy = Retry(total = retries,
+                             backoff_factor = backoff_factor,
+                             status = 0,
+                             allowed_methods = frozenset(['GET']),
+                             raise_on_status = False) #retries connection failures, sleeping backoff_factor * 2^n between tries.  Throttled and failed responses are retried by TBAParser's TBABackoff instead
+
+        adapter = HTTPAdapter(pool_connections = pool_size, pool_maxsize = pool_size, max_retries = retry_policy)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def get(self, url, headers = None): #Makes a GET request over the pooled session and returns the requests.Response
+        response = self.session.get(url, headers = headers, timeout = self.timeout)
+        return response
+
+    def close(self): #Closes every pooled connection.  The transport can not be used after this is called
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
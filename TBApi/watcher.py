@@ -0,0 +1,111 @@
+#TBApi - live event watcher that reports only the matches and rankings that changed between polls
+
+import threading
+from .models import TBAMatch, TBAEventTeamRank
+from .cache import TBAMemoryCache
+
+#Class that holds what changed at an event between two polls of a TBAEventWatcher
+class TBAEventUpdate:
+    def __init__(self, event_key, matches, new_match_keys, rankings):
+        self.event_key = event_key
+        self.matches = matches #TBAMatch objects that were added or changed, in the order TBA lists them
+        self.new_match_keys = new_match_keys #keys of the matches in matches that had not been seen before
+        self.rankings = rankings #TBAEventTeamRank objects for teams whose ranking row was added or changed
+
+    def __bool__(self):
+        return bool(self.matches or self.rankings)
+
+    __nonzero__ = __bool__
+
+#Class that polls an event's matches and rankings and yields only what changed.  Polls are conditional requests made through the watcher's own cache (a small TBAMemoryCache unless cache is given), so the parser's other requests are not affected.  Unchanged bodies are not decoded at all, and objects are only built for changed records.  The poll interval drops to min_interval when something changes and grows by backoff on every quiet poll, up to max_interval
+class TBAEventWatcher:
+    def __init__(self, parser, event_key, min_interval = 5.0, max_interval = 60.0, backoff = 1.5, matches = True, rankings = True, cache = None):
+        self.parser = parser
+        self.event_key = event_key
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.watch_matches = matches
+        self.watch_rankings = rankings
+        self.polls = 0
+        self.cache = cache if cache is not None else TBAMemoryCache(max_entries = 2) #holds the last matches and rankings bodies for revalidation
+
+        self._bodies = {} #path -> body seen on the last poll
+        self._matches = {} #match key -> raw match json
+        self._rank_keys = None #ranking header row
+        self._ranks = {} #team number -> raw ranking row
+
+    def __pull_changed(self, path): #returns the decoded body of path, or None if it is byte-for-byte the same as last poll
+        body = self.parser._pull(path, cache = self.cache)
+        if self._bodies.get(path) == body:
+            return None
+        self._bodies[path] = body
+        return self.parser.decoder(body)
+
+    def __diff_matches(self, json):
+        changed = []
+        new_keys = set()
+        for raw in json:
+            old_raw = self._matches.get(raw['key'])
+            if old_raw != raw:
+                if old_raw is None:
+                    new_keys.add(raw['key'])
+                self._matches[raw['key']] = raw
+                changed.append(self.parser._model(TBAMatch, raw))
+        return changed, new_keys
+
+    def __diff_rankings(self, json):
+        if not json:
+            return []
+
+        keys = json[0]
+        if keys != self._rank_keys: #new columns mean every row has changed
+            self._rank_keys = keys
+            self._ranks = {}
+
+        changed = []
+        for row in json[1:]:
+            team_number = str(row[1])
+            if self._ranks.get(team_number) != row:
+                self._ranks[team_number] = row
+                changed.append(TBAEventTeamRank(keys, row))
+        return changed
+
+    def poll(self): #polls once and returns a TBAEventUpdate, which is false if nothing changed
+        self.polls += 1
+        matches, new_match_keys, rankings = [], set(), []
+
+        if self.watch_matches:
+            json = self.__pull_changed("/event/" + self.event_key + "/matches")
+            if json is not None:
+                matches, new_match_keys = self.__diff_matches(json)
+
+        if self.watch_rankings:
+            json = self.__pull_changed("/event/" + self.event_key + "/rankings")
+            if json is not None:
+                rankings = self.__diff_rankings(json)
+
+        update = TBAEventUpdate(self.event_key, matches, new_match_keys, rankings)
+        if update:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return update
+
+    def watch(self, stop_event = None, max_polls = None): #Generator that polls until stop_event (a threading.Event) is set or max_polls polls have been made, yielding a TBAEventUpdate whenever something changed.  The first update holds everything already posted
+        if stop_event is None:
+            stop_event = threading.Event()
+
+        polls = 0
+        while not stop_event.is_set() and (max_polls is None or polls < max_polls):
+            update = self.poll()
+            polls += 1
+            if update:
+                yield update
+            if max_polls is None or polls < max_polls:
+                stop_event.wait(self.interval)
+
+    def run(self, callback, stop_event = None, max_polls = None): #Calls callback(update) for every TBAEventUpdate that watch would yield
+        for update in self.watch(stop_event, max_polls):
+            callback(update)
@@ -0,0 +1,83 @@
+#TBApi benchmark - TBAAsyncParser against the local fake TBA server in fake_tba.py.  Requires aiohttp
+#Checks and times: many events requested together with asyncio.gather, revalidating a TBAMemoryCache with 304 responses, and TBAError on a 404
+#Run from the repository root with: python benchmarks/bench_async.py [--latency SECONDS]
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import TBApi
+from fake_tba import FakeTBAServer, YEAR, EVENT_COUNT, QUAL_MATCHES
+
+EVENT_KEYS = ['%dev%03d' % (YEAR, number) for number in range(EVENT_COUNT)]
+
+def report(name, requests, seconds, note = ''):
+    print('{0:<34}{1:>9}{2:>11.3f}  {3}'.format(name, requests, seconds, note))
+
+async def gather_scenario(server, max_concurrency): #every event's matches at once, then the same requests one at a time
+    async with TBApi.TBAAsyncParser(2403, 'benchmark', '1.0', max_concurrency = max_concurrency) as parser:
+        parser.baseURL = server.base_url
+
+        server.reset_counters()
+        started = time.time()
+        match_lists = await asyncio.gather(*[parser.get_event_matches(event_key) for event_key in EVENT_KEYS])
+        report('gather get_event_matches x%d' % len(EVENT_KEYS), server.requests, time.time() - started, 'max_concurrency %d' % max_concurrency)
+        assert [len(match_list) for match_list in match_lists] == [QUAL_MATCHES] * len(EVENT_KEYS)
+        assert all(match_list[0].event_key == event_key for match_list, event_key in zip(match_lists, EVENT_KEYS))
+
+        server.reset_counters()
+        started = time.time()
+        for event_key in EVENT_KEYS:
+            await parser.get_event_matches(event_key)
+        report('sequential get_event_matches x%d' % len(EVENT_KEYS), server.requests, time.time() - started)
+
+async def cache_scenario(server): #the server sends max-age=0, so the second pass revalidates every body and gets 304s with no body
+    cache = TBApi.TBAMemoryCache()
+    async with TBApi.TBAAsyncParser(2403, 'benchmark', '1.0', cache = cache) as parser:
+        parser.baseURL = server.base_url
+        event_keys = EVENT_KEYS[:20]
+
+        server.reset_counters()
+        started = time.time()
+        first = await asyncio.gather(*[parser.get_event_teams(event_key) for event_key in event_keys])
+        report('cache first pass x%d' % len(event_keys), server.requests, time.time() - started, '%d bytes' % server.bytes_sent)
+
+        server.reset_counters()
+        started = time.time()
+        second = await asyncio.gather(*[parser.get_event_teams(event_key) for event_key in event_keys])
+        report('cache 304 pass x%d' % len(event_keys), server.requests, time.time() - started, '%d bytes, %r' % (server.bytes_sent, cache.stats()))
+
+        assert server.bytes_sent == 0 and cache.revalidations == len(event_keys)
+        assert [[team.key for team in teams] for teams in first] == [[team.key for team in teams] for teams in second]
+
+async def error_scenario(server):
+    async with TBApi.TBAAsyncParser(2403, 'benchmark', '1.0') as parser:
+        parser.baseURL = server.base_url
+        server.reset_counters()
+        started = time.time()
+        results = await asyncio.gather(parser.get_event(EVENT_KEYS[0]), parser.get_event('%dev999' % YEAR), return_exceptions = True)
+        report('404 inside gather', server.requests, time.time() - started, repr(results[1]))
+        assert results[0].key == EVENT_KEYS[0]
+        assert isinstance(results[1], TBApi.TBAError) and results[1].status_code == 404
+
+def main():
+    arguments = argparse.ArgumentParser(description = 'TBApi asyncio benchmarks')
+    arguments.add_argument('--latency', type = float, default = 0.01, help = 'seconds the fake server waits before answering each request')
+    options = arguments.parse_args()
+
+    print('{0:<34}{1:>9}{2:>11}'.format('scenario', 'requests', 'seconds'))
+    with FakeTBAServer(latency = options.latency, max_age = 0) as server:
+        for event_key in EVENT_KEYS: #builds the synthetic bodies up front, so only serving them is timed
+            server.body('/event/%s/matches' % event_key)
+            server.body('/event/%s/teams' % event_key)
+        asyncio.run(gather_scenario(server, 20))
+        asyncio.run(cache_scenario(server))
+        asyncio.run(error_scenario(server))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#TBApi benchmark - json decoding throughput of each decoder backend, and the cost of building match objects with and without field projection
+#Bodies come from the synthetic payloads in fake_tba.py, so no server is started
+#Run from the repository root with: python benchmarks/bench_decode.py [repeat]
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import TBApi
+from TBApi.decode import project
+from fake_tba import route, YEAR
+
+#(name, path) of the bodies decoded
+BODIES = [('event matches', '/event/%dev000/matches' % YEAR),
+          ('event list', '/events/%d' % YEAR),
+          ('team page', '/teams/0'),
+          ('event rankings', '/event/%dev000/rankings' % YEAR)]
+
+MATCH_FIELDS = ('key', 'event_key', 'comp_level', 'set_number', 'match_number', 'time', 'alliances')
+
+def decoders(): #(name, loads) for every backend installed
+    found = [('json', TBApi.get_decoder('json'))]
+    try:
+        found.append(('orjson', TBApi.get_decoder('orjson')))
+    except ImportError:
+        print('orjson is not installed; only the json backend is measured')
+    return found
+
+def best_time(function, repeat): #fastest of repeat runs, in seconds
+    best = None
+    for run in range(repeat):
+        started = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+def retained(function): #bytes still allocated by function's result once it returns
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+def main(repeat = 20):
+    bodies = [(name, json.dumps(route(path)).encode('utf-8')) for name, path in BODIES]
+
+    print('{0:<18}{1:<10}{2:>10}{3:>12}'.format('body', 'decoder', 'KiB', 'MiB/s'))
+    for body_name, body in bodies:
+        for decoder_name, loads in decoders():
+            seconds = best_time(lambda: loads(body), repeat)
+            print('{0:<18}{1:<10}{2:>10.1f}{3:>12.1f}'.format(body_name, decoder_name, len(body) / 1024.0, len(body) / 1048576.0 / seconds))
+
+    matches_body = bodies[0][1]
+    print('')
+    print('{0:<34}{1:>12}{2:>14}'.format('TBAMatch list from bytes', 'ms', 'retained KiB'))
+    for decoder_name, loads in decoders():
+        cases = [('full, ' + decoder_name, lambda: [TBApi.TBAMatch(raw) for raw in loads(matches_body)]),
+                 ('projected, ' + decoder_name, lambda: [TBApi.TBAMatch(raw) for raw in project(loads(matches_body), MATCH_FIELDS)])]
+        for name, case in cases:
+            print('{0:<34}{1:>12.2f}{2:>14.1f}'.format(name, best_time(case, repeat) * 1000, retained(case) / 1024.0))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,40 @@
+#TBApi benchmark - startup cost of importing TBApi.  Each case runs in a fresh interpreter, so nothing is already imported
+#Run from the repository root with: python benchmarks/bench_import.py [runs]
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+#(name, statement run after 'import TBApi')
+CASES = [('import TBApi', 'pass'),
+         ('TBApi.TBATeam', 'TBApi.TBATeam'),
+         ('TBApi.TBAParser', 'TBApi.TBAParser'),
+         ('TBAParser()', "TBApi.TBAParser(2403, 'bench', '1.0')"),
+         ('TBApi.TBAEventRankings([...])', "TBApi.TBAEventRankings([['Rank', 'Team'], [1, '2403']])"),
+         ('every name in __all__', "[getattr(TBApi, name) for name in TBApi.__all__]")]
+
+PROGRAM = """
+import sys, time, json
+started = time.perf_counter()
+import TBApi
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'numpy': 'numpy' in sys.modules, 'requests': 'requests' in sys.modules}}))
+"""
+
+def run_case(statement):
+    output = subprocess.check_output([sys.executable, '-c', PROGRAM.format(statement = statement)], cwd = ROOT)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+def main(runs = 5):
+    print('{0:<32}{1:>12}{2:>8}{3:>10}'.format('case', 'best ms', 'numpy', 'requests'))
+    for name, statement in CASES:
+        results = [run_case(statement) for run in range(runs)]
+        best = min(result['seconds'] for result in results)
+        print('{0:<32}{1:>12.1f}{2:>8}{3:>10}'.format(name, best * 1000, str(results[0]['numpy']), str(results[0]['requests'])))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,64 @@
+#TBApi benchmark - memory used per model object by the regular TBApi classes versus their __slots__ based TBACompact* counterparts
+#Run from the repository root with: python benchmarks/bench_models.py [count]
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from TBApi import TBATeam, TBAEvent, TBAMatch, TBAAward, TBAMedia, TBARobot
+from TBApi.compact import TBACompactTeam, TBACompactEvent, TBACompactMatch, TBACompactAward, TBACompactMedia, TBACompactRobot
+
+def team_json(number):
+    return {'website': 'http://team%d.org' % number, 'name': 'Sponsors of team %d' % number, 'locality': 'Chandler', 'region': 'Arizona',
+            'country_name': 'USA', 'location': 'Chandler, Arizona, USA', 'team_number': number, 'key': 'frc%d' % number,
+            'nickname': 'Team %d' % number, 'rookie_year': 2008, 'motto': None}
+
+def event_json(number):
+    return {'key': '2016ev%d' % number, 'website': None, 'official': True, 'end_date': '2016-03-05', 'name': 'Event %d' % number,
+            'short_name': 'Event %d' % number, 'facebook_eid': None, 'event_district_string': None, 'venue_address': '1 Main St',
+            'event_district': 0, 'location': 'Phoenix, AZ, USA', 'event_code': 'ev%d' % number, 'year': 2016, 'webcast': [],
+            'timezone': 'America/Phoenix', 'alliances': [], 'event_type_string': 'Regional', 'start_date': '2016-03-02', 'event_type': 0}
+
+def match_json(number):
+    breakdown = dict(('field%d' % field, field) for field in range(40))
+    return {'comp_level': 'qm', 'match_number': number, 'videos': [], 'time_string': '9:00 AM', 'set_number': 1, 'key': '2016azch_qm%d' % number,
+            'time': 1457000000 + number, 'score_breakdown': {'red': dict(breakdown), 'blue': dict(breakdown)},
+            'alliances': {'red': {'score': 100, 'teams': ['frc1', 'frc2', 'frc3']}, 'blue': {'score': 90, 'teams': ['frc4', 'frc5', 'frc6']}},
+            'event_key': '2016azch'}
+
+def award_json(number):
+    return {'event_key': '2016azch', 'award_type': 1, 'name': 'Award %d' % number, 'recipient_list': [], 'year': 2016}
+
+def media_json(number):
+    return {'type': 'youtube', 'details': {}, 'foreign_key': 'video%d' % number}
+
+def robot_json(number):
+    return {'team_key': 'frc%d' % number, 'name': 'Robot %d' % number, 'key': 'frc%d_2016' % number, 'year': 2016}
+
+CASES = [('team', team_json, TBATeam, TBACompactTeam),
+         ('event', event_json, TBAEvent, TBACompactEvent),
+         ('match', match_json, TBAMatch, TBACompactMatch),
+         ('award', award_json, TBAAward, TBACompactAward),
+         ('media', media_json, TBAMedia, TBACompactMedia),
+         ('robot', robot_json, TBARobot, TBACompactRobot)]
+
+def bytes_per_object(model_class, raw_list): #memory allocated for the model objects alone, not the raw json they wrap
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [model_class(raw_json) for raw_json in raw_list]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / float(len(objects))
+
+def main(count = 20000):
+    print('{0:<8}{1:>14}{2:>14}{3:>10}'.format('model', 'regular B/obj', 'compact B/obj', 'saved'))
+    for name, make_json, regular_class, compact_class in CASES:
+        raw_list = [make_json(number) for number in range(count)]
+        regular = bytes_per_object(regular_class, raw_list)
+        compact = bytes_per_object(compact_class, raw_list)
+        print('{0:<8}{1:>14.1f}{2:>14.1f}{3:>9.0f}%'.format(name, regular, compact, 100.0 * (regular - compact) / regular))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
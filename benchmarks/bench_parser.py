@@ -0,0 +1,108 @@
+#TBApi benchmark - end to end TBAParser performance against the local fake TBA server in fake_tba.py
+#Reports, for each scenario: requests the server answered, wall time, peak Python memory, and objects built per second
+#Run from the repository root with: python benchmarks/bench_parser.py [--latency SECONDS] [--repeat N] [--recorded DIRECTORY] [--compact] [--identity-map]
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import TBApi
+from fake_tba import FakeTBAServer, YEAR, EVENT_COUNT
+
+#Runs scenario once under tracemalloc and returns (result, requests, seconds, peak bytes)
+def measure(server, scenario):
+    server.reset_counters()
+    tracemalloc.start()
+    started = time.time()
+    result = scenario()
+    seconds = time.time() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, server.requests, seconds, peak
+
+def count_objects(result): #counts the TBApi objects in a scenario's result, looking inside lists and dictionaries
+    if isinstance(result, (list, tuple)):
+        return sum(count_objects(item) for item in result)
+    if isinstance(result, dict):
+        return sum(count_objects(value) for value in result.values())
+    if result is None or isinstance(result, (str, int, float)):
+        return 0
+    return 1
+
+def report(name, requests, seconds, peak, objects):
+    print('{0:<34}{1:>9}{2:>11.3f}{3:>12.1f}{4:>14.0f}'.format(name, requests, seconds, peak / 1048576.0, objects / seconds if seconds else 0))
+
+#Builds the scenarios that talk to the server.  Each is a (name, function) pair
+def parser_scenarios(parser):
+    event_keys = ['%dev%03d' % (YEAR, number) for number in range(0, EVENT_COUNT, EVENT_COUNT // 8)]
+    names = ['synthetic %03d' % number for number in range(EVENT_COUNT)]
+
+    return [('get_team_list', lambda: parser.get_team_list()),
+            ('get_team x100', lambda: [parser.get_team('frc%d' % number) for number in range(1, 101)]),
+            ('get_event_list', lambda: parser.get_event_list(YEAR)),
+            ('get_event_matches x8', lambda: [parser.get_event_matches(key) for key in event_keys]),
+            ('get_event_matches_batch x8', lambda: parser.get_event_matches_batch(event_keys)),
+            ('get_event_rankings x8', lambda: [parser.get_event_rankings(key) for key in event_keys]),
+            ('get_event_teams x8 x5', lambda: [parser.get_event_teams(key) for repeat in range(5) for key in event_keys]),
+            ('get_event_district_points x8', lambda: [parser.get_event_district_points(key) for key in event_keys]),
+            ('calc_event_key x%d' % len(names), lambda: [parser.calc_event_key(YEAR, name) for name in names])]
+
+#Builds the scenarios that only construct model objects from json already in memory, to measure parse cost on its own
+def model_scenarios(server, compact):
+    import json
+    from TBApi.compact import TBACompactTeam, TBACompactEvent, TBACompactMatch, TBACompactAward
+
+    teams = json.loads(server.body('/teams/0'))
+    events = json.loads(server.body('/events/%d' % YEAR))
+    matches = json.loads(server.body('/event/%dev000/matches' % YEAR))
+    awards = json.loads(server.body('/event/%dev000/awards' % YEAR))
+    rankings_body = server.body('/event/%dev000/rankings' % YEAR)
+
+    classes = [('TBATeam', TBApi.TBATeam, teams), ('TBAEvent', TBApi.TBAEvent, events), ('TBAMatch', TBApi.TBAMatch, matches), ('TBAAward', TBApi.TBAAward, awards)]
+    if compact:
+        classes += [('TBACompactTeam', TBACompactTeam, teams), ('TBACompactEvent', TBACompactEvent, events),
+                    ('TBACompactMatch', TBACompactMatch, matches), ('TBACompactAward', TBACompactAward, awards)]
+
+    scenarios = [('build %s x100' % name, (lambda model_class, raw_list: lambda: [model_class(raw) for raw in raw_list * 100])(model_class, raw_list))
+                 for name, model_class, raw_list in classes]
+    scenarios.append(('build TBAEventRankings x100', lambda: [TBApi.TBAEventRankings(json.loads(rankings_body)) for repeat in range(100)]))
+    return scenarios
+
+def main():
+    arguments = argparse.ArgumentParser(description = 'TBApi end to end benchmarks')
+    arguments.add_argument('--latency', type = float, default = 0.0, help = 'seconds the fake server waits before answering each request')
+    arguments.add_argument('--repeat', type = int, default = 1, help = 'runs of each scenario; the fastest is reported')
+    arguments.add_argument('--recorded', default = None, help = 'directory of recorded responses to serve instead of synthetic ones')
+    arguments.add_argument('--compact', action = 'store_true', help = 'build TBACompact* model objects')
+    arguments.add_argument('--identity-map', action = 'store_true', help = 'share one object per team, event and match key through a TBAIdentityMap')
+    options = arguments.parse_args()
+
+    with FakeTBAServer(latency = options.latency, recorded_directory = options.recorded) as server:
+        print('{0:<34}{1:>9}{2:>11}{3:>12}{4:>14}'.format('scenario', 'requests', 'seconds', 'peak MiB', 'objects/s'))
+
+        for run_name in [name for name, scenario in parser_scenarios(None)]:
+            best = None
+            for repeat in range(options.repeat):
+                with TBApi.TBAParser(2403, 'benchmark', '1.0', compact_models = options.compact, identity_map = TBApi.TBAIdentityMap() if options.identity_map else None) as parser: #a new parser each run, so no run benefits from another's cached state
+                    parser.baseURL = server.base_url
+                    scenario = dict(parser_scenarios(parser))[run_name]
+                    result, requests, seconds, peak = measure(server, scenario)
+                    if best is None or seconds < best[1]:
+                        best = (requests, seconds, peak, count_objects(result))
+            report(run_name, *best)
+
+        for name, scenario in model_scenarios(server, options.compact):
+            best = None
+            for repeat in range(options.repeat):
+                result, requests, seconds, peak = measure(server, scenario)
+                if best is None or seconds < best[1]:
+                    best = (requests, seconds, peak, count_objects(result))
+            report(name, *best)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#TBApi benchmark - local stand-in for the TBA v2 API.  Serves deterministic synthetic payloads shaped like TBA's (a paginated team list, a season of events, match lists with full score_breakdowns, rankings, stats, awards and district points), or recorded payloads from a directory, and counts every request it answers
+#Run on its own with: python benchmarks/fake_tba.py [port]
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+from email.utils import formatdate
+
+try:
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+except ImportError: #python < 3.7
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+
+    class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+YEAR = 2016
+TEAM_COUNT = 6500
+TEAMS_PER_PAGE = 500
+EVENT_COUNT = 160
+TEAMS_PER_EVENT = 48
+QUAL_MATCHES = 80
+BREAKDOWN_FIELDS = ['autoPoints', 'teleopPoints', 'foulPoints', 'adjustPoints', 'totalPoints', 'autoBoulderPoints', 'autoCrossingPoints', 'autoReachPoints',
+                    'teleopBoulderPoints', 'teleopCrossingPoints', 'teleopChallengePoints', 'teleopScalePoints', 'teleopDefensesBreached', 'teleopTowerCaptured',
+                    'breachPoints', 'capturePoints', 'autoBouldersLow', 'autoBouldersHigh', 'teleopBouldersLow', 'teleopBouldersHigh', 'towerEndStrength',
+                    'position1crossings', 'position2crossings', 'position3crossings', 'position4crossings', 'position5crossings', 'techFoulCount', 'foulCount']
+LAST_MODIFIED = formatdate(1457000000, usegmt = True)
+
+def team_json(number):
+    return {'website': 'http://www.team%d.org' % number, 'name': 'Sponsors & Friends of Team %d' % number, 'locality': 'Chandler', 'region': 'Arizona',
+            'country_name': 'USA', 'location': 'Chandler, Arizona, USA', 'team_number': number, 'key': 'frc%d' % number,
+            'nickname': 'Team %d' % number, 'rookie_year': 1992 + number % 25, 'motto': None}
+
+def event_json(number):
+    key = '%dev%03d' % (YEAR, number)
+    return {'key': key, 'website': None, 'official': True, 'end_date': '%d-03-05' % YEAR, 'name': 'Synthetic Regional %03d' % number,
+            'short_name': 'Synthetic %03d' % number, 'facebook_eid': None, 'event_district_string': None, 'venue_address': '1 Arena Way',
+            'event_district': 0, 'location': 'Phoenix, AZ, USA', 'event_code': key[4:], 'year': YEAR, 'webcast': [], 'timezone': 'America/Phoenix',
+            'alliances': [], 'event_type_string': 'Regional', 'start_date': '%d-03-02' % YEAR, 'event_type': 0}
+
+def event_teams(event_key):
+    generator = random.Random(event_key)
+    return sorted(generator.sample(range(1, TEAM_COUNT + 1), TEAMS_PER_EVENT))
+
+def alliance_breakdown(generator):
+    breakdown = dict((field, generator.randint(0, 60)) for field in BREAKDOWN_FIELDS)
+    breakdown['teleopDefensesBreached'] = generator.random() < 0.5
+    breakdown['teleopTowerCaptured'] = generator.random() < 0.2
+    breakdown['position2'] = 'A_ChevalDeFrise'
+    return breakdown
+
+def matches_json(event_key):
+    generator = random.Random(event_key + 'matches')
+    teams = event_teams(event_key)
+    matches = []
+    for number in range(1, QUAL_MATCHES + 1):
+        playing = generator.sample(teams, 6)
+        red = alliance_breakdown(generator)
+        blue = alliance_breakdown(generator)
+        matches.append({'comp_level': 'qm', 'match_number': number, 'videos': [{'type': 'youtube', 'key': 'v%s%d' % (event_key, number)}],
+                        'time_string': None, 'set_number': 1, 'key': '%s_qm%d' % (event_key, number), 'time': 1457000000 + number * 420,
+                        'score_breakdown': {'red': red, 'blue': blue}, 'event_key': event_key,
+                        'alliances': {'red': {'score': red['totalPoints'], 'teams': ['frc%d' % team for team in playing[:3]]},
+                                      'blue': {'score': blue['totalPoints'], 'teams': ['frc%d' % team for team in playing[3:]]}}})
+    return matches
+
+def rankings_json(event_key):
+    generator = random.Random(event_key + 'rankings')
+    rows = [['Rank', 'Team', 'Ranking Score', 'Auto', 'Scale/Challenge', 'Goals', 'Defense', 'Record (W-L-T)', 'Played']]
+    for rank, team in enumerate(event_teams(event_key)):
+        rows.append([rank + 1, str(team), round(generator.uniform(0, 30), 2), generator.randint(0, 300), generator.randint(0, 300),
+                     generator.randint(0, 300), generator.randint(0, 300), '%d-%d-0' % (generator.randint(0, 12), generator.randint(0, 12)), 12])
+    return rows
+
+def stats_json(event_key):
+    generator = random.Random(event_key + 'stats')
+    teams = event_teams(event_key)
+    return dict((name, dict((str(team), generator.uniform(-20, 80)) for team in teams)) for name in ('oprs', 'dprs', 'ccwms'))
+
+def awards_json(event_key):
+    teams = event_teams(event_key)
+    return [{'event_key': event_key, 'award_type': award_type, 'name': 'Award %d' % award_type, 'year': YEAR,
+             'recipient_list': [{'team_number': teams[award_type], 'awardee': None}]} for award_type in range(10)]
+
+def district_points_json(event_key):
+    generator = random.Random(event_key + 'points')
+    points = {}
+    for team in event_teams(event_key):
+        team_points = {'qual_points': generator.randint(4, 22), 'elim_points': generator.choice([0, 0, 5, 10, 20, 30]),
+                       'alliance_points': generator.randint(0, 16), 'award_points': generator.choice([0, 0, 0, 5, 8, 10])}
+        team_points['total'] = sum(team_points.values())
+        points['frc%d' % team] = team_points
+    return {'points': points, 'tiebreakers': {}}
+
+#District key -> numbers of the events in it.  Every other event is a regional
+DISTRICTS = {'fa': range(0, 20), 'fb': range(20, 40)}
+
+def district_teams(district_key):
+    numbers = sorted(set(team for event in DISTRICTS[district_key] for team in event_teams('%dev%03d' % (YEAR, event))))
+    return [team_json(number) for number in numbers]
+
+#Returns the json for a /api/v2 path, or None if there is nothing at that path
+def route(path):
+    parts = path.strip('/').split('/')
+    try:
+        if parts[0] == 'teams':
+            page = int(parts[1])
+            return [team_json(number) for number in range(page * TEAMS_PER_PAGE + 1, min((page + 1) * TEAMS_PER_PAGE, TEAM_COUNT) + 1)]
+        if parts[0] == 'team' and len(parts) == 2:
+            return team_json(int(parts[1][3:]))
+        if parts[0] == 'events':
+            return [event_json(number) for number in range(EVENT_COUNT)] if int(parts[1]) == YEAR else []
+        if parts[0] == 'event':
+            event_number = int(parts[1][-3:])
+            if event_number >= EVENT_COUNT:
+                return None
+            if len(parts) == 2:
+                return event_json(event_number)
+            endpoints = {'teams': lambda key: [team_json(team) for team in event_teams(key)], 'matches': matches_json, 'rankings': rankings_json,
+                         'stats': stats_json, 'awards': awards_json, 'district_points': district_points_json}
+            return endpoints[parts[2]](parts[1])
+        if parts[0] == 'districts':
+            return [{'key': key, 'name': 'District ' + key.upper()} for key in sorted(DISTRICTS)] if int(parts[1]) == YEAR else []
+        if parts[0] == 'district' and int(parts[2]) == YEAR:
+            if parts[3] == 'events':
+                return [event_json(number) for number in DISTRICTS[parts[1]]]
+            if parts[3] == 'teams':
+                return district_teams(parts[1])
+        if parts[0] == 'match':
+            for match in matches_json(parts[1].split('_')[0]):
+                if match['key'] == parts[1]:
+                    return match
+    except (ValueError, KeyError, IndexError):
+        pass
+    return None
+
+#HTTP server answering /api/v2 requests.  latency seconds are slept before each answer to stand in for the network
+class FakeTBAServer:
+    def __init__(self, port = 0, latency = 0.0, recorded_directory = None, max_age = 61): #recorded_directory holds recorded responses, named by their path with '/' replaced by '_' plus '.json' (for example event_2016casj_matches.json), which are served in place of synthetic ones.  max_age is sent in Cache-Control; 0 makes every cached response revalidate
+        self.latency = latency
+        self.max_age = max_age
+        self.recorded_directory = recorded_directory
+        self.requests = 0
+        self.bytes_sent = 0
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.__handler())
+        self.server.daemon_threads = True
+        self.base_url = 'http://127.0.0.1:%d/api/v2' % self.server.server_address[1]
+        self._thread = None
+
+    def body(self, path): #returns the encoded response body for a path relative to /api/v2, or None
+        with self._lock:
+            if path in self._bodies:
+                return self._bodies[path]
+
+        body = None
+        if self.recorded_directory is not None:
+            recorded_path = os.path.join(self.recorded_directory, path.strip('/').replace('/', '_') + '.json')
+            if os.path.exists(recorded_path):
+                with open(recorded_path, 'rb') as recorded_file:
+                    body = recorded_file.read()
+        if body is None:
+            data = route(path)
+            if data is not None:
+                body = json.dumps(data).encode('utf-8')
+
+        with self._lock:
+            self._bodies[path] = body
+        return body
+
+    def __handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True #headers and body are written separately, which would otherwise stall keep-alive connections on delayed ACKs
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                body = fake.body(self.path.split('/api/v2', 1)[-1]) if '/api/v2' in self.path else None
+                if body is None:
+                    status, body = 404, b'{"404": "Not found"}'
+                elif self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+                    status, body = 304, b''
+                else:
+                    status = 200
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Last-Modified', LAST_MODIFIED)
+                self.send_header('Cache-Control', 'public, max-age=%d' % fake.max_age)
+                self.end_headers()
+                self.wfile.write(body)
+                with fake._lock:
+                    fake.bytes_sent += len(body)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target = self.server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+if __name__ == '__main__':
+    server = FakeTBAServer(int(sys.argv[1]) if len(sys.argv) > 1 else 8080)
+    print('Serving fake TBA API at ' + server.base_url)
+    server.server.serve_forever()
@@ -0,0 +1,20 @@
+#Tests for TBApi.decode
+
+import pytest
+from TBApi.decode import get_decoder, json_loads, project
+
+def test_project_clears_other_fields_in_place():
+    json = [{'key': 'a', 'time': 1, 'score_breakdown': {'red': {}}}, {'key': 'b', 'time': 2, 'score_breakdown': None}]
+    first = json[0]
+    assert project(json, ('key', 'time')) is json
+    assert json[0] is first
+    assert json == [{'key': 'a', 'time': 1, 'score_breakdown': None}, {'key': 'b', 'time': 2, 'score_breakdown': None}]
+
+def test_project_single_object():
+    assert project({'key': 'a', 'videos': [1]}, ['key']) == {'key': 'a', 'videos': None}
+
+def test_decoders():
+    assert get_decoder('json')(b'[1, {"a": 2}]') == [1, {'a': 2}]
+    assert json_loads(b'{"a": [1]}') == {'a': [1]}
+    with pytest.raises(ValueError):
+        get_decoder('yaml')
@@ -0,0 +1,88 @@
+#Tests for TBADistrictStandings and TBAParser.get_district_standings
+
+import json
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from TBApi.district import TBADistrictStandings
+from TBApi.parser import TBAParser
+from TBApi.transport import TBAResponse
+
+def district_points(teams): #district_points json for {team key: (qual, elim, alliance, award)}
+    return {'points': dict((team_key, {'qual_points': qual, 'elim_points': elim, 'alliance_points': alliance, 'award_points': award, 'total': qual + elim + alliance + award})
+                           for team_key, (qual, elim, alliance, award) in teams.items())}
+
+EVENTS = {'2016a': district_points({'frc1': (20, 10, 5, 5), 'frc2': (15, 20, 10, 0), 'frc3': (10, 0, 0, 5)}),
+          '2016b': district_points({'frc1': (18, 30, 16, 5), 'frc3': (22, 10, 8, 0), 'frc4': (12, 0, 0, 0)}),
+          '2016c': district_points({'frc1': (10, 0, 0, 0), 'frc2': (20, 5, 3, 8), 'frc4': (21, 15, 12, 5)}),
+          '2016cmp': district_points({'frc1': (30, 20, 10, 0), 'frc4': (25, 30, 15, 10)})}
+
+def standings_table(standings):
+    return standings.ranking(), dict((team_key, standings.get_team(team_key)) for team_key in standings.ranking())
+
+def test_best_events_plus_championship():
+    standings = TBADistrictStandings(championship_multiplier = 3).add_events(EVENTS, ['2016cmp'])
+    frc1 = standings.get_team('frc1')
+    assert frc1['total'] == (40 + 69) + 3 * 60 #2016c is its third best regular event, so it is not counted
+    assert frc1['events'] == ['2016a', '2016b', '2016c', '2016cmp']
+    assert standings.ranking() == ['frc4', 'frc1', 'frc2', 'frc3']
+
+def test_update_event_matches_full_add():
+    updated_b = district_points({'frc1': (5, 0, 0, 0), 'frc2': (25, 40, 16, 10), 'frc4': (12, 0, 0, 0)}) #frc3 dropped, frc2 added
+    events = dict(EVENTS)
+    events['2016b'] = updated_b
+
+    full = TBADistrictStandings().add_events(events, ['2016cmp'])
+    incremental = TBADistrictStandings().add_events(EVENTS, ['2016cmp']).update_event('2016b', updated_b)
+
+    assert standings_table(incremental) == standings_table(full)
+    assert np.array_equal(incremental.to_array(), full.to_array())
+    assert '2016b' not in incremental.get_team('frc3')['events']
+
+def test_update_event_adds_new_event():
+    first = dict((key, EVENTS[key]) for key in ('2016a', '2016b'))
+    incremental = TBADistrictStandings().add_events(first)
+    for event_key in ('2016c', '2016cmp'):
+        incremental.update_event(event_key, EVENTS[event_key], championship = event_key == '2016cmp')
+    assert standings_table(incremental) == standings_table(TBADistrictStandings().add_events(EVENTS, ['2016cmp']))
+
+def test_tie_breaks():
+    standings = TBADistrictStandings().add_events({'2016a': district_points({'frc5': (20, 10, 5, 5), 'frc6': (20, 20, 0, 0), 'frc7': (30, 10, 0, 0),
+                                                                              'frc8': (30, 10, 0, 0), 'frc9': (25, 10, 5, 0)})})
+    #every team has 40 points: frc6 has the most elimination points, then the best qual points decide, then alliance points, then team number
+    assert standings.ranking() == ['frc6', 'frc7', 'frc8', 'frc9', 'frc5']
+    assert [standings.get_rank(team_key) for team_key in ('frc6', 'frc5')] == [1, 5]
+    assert standings.get_rank('frc99') is None
+
+#Transport that answers every request from a {path: json} dictionary
+class DictTransport:
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def get(self, url, headers = None):
+        path = url[url.index('/api/v2') + len('/api/v2'):]
+        if path not in self.bodies:
+            return TBAResponse(404, {}, b'{}')
+        return TBAResponse(200, {}, json.dumps(self.bodies[path]).encode('utf-8'))
+
+    def close(self):
+        pass
+
+def event_json(key, event_type):
+    return {'key': key, 'website': None, 'official': True, 'end_date': None, 'name': key, 'short_name': key, 'facebook_eid': None,
+            'event_district_string': 'Test', 'venue_address': None, 'event_district': 1, 'location': None, 'event_code': key[4:],
+            'year': 2016, 'webcast': [], 'timezone': None, 'alliances': [], 'event_type_string': None, 'start_date': None, 'event_type': event_type}
+
+def test_championship_divisions_are_championships():
+    bodies = {'/district/te/2016/events': [event_json('2016a', 1), event_json('2016b', 1), event_json('2016c', 1), event_json('2016cmp', 5)]}
+    for event_key, points in EVENTS.items():
+        bodies['/event/' + event_key + '/district_points'] = points
+    parser = TBAParser(2403, 'tests', '1', transport = DictTransport(bodies))
+
+    standings = parser.get_district_standings('te', 2016)
+    assert standings.get_team('frc1')['total'] == 40 + 69 + 60
+    assert standings.championship.tolist() == [False, False, False, True]
+
+    standings = parser.get_district_standings('te', 2016, championship_keys = ())
+    assert standings.get_team('frc1')['total'] == 69 + 60 #the division now counts as a regular event
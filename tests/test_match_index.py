@@ -0,0 +1,81 @@
+#Tests for TBApi.match_index
+
+import pytest
+from TBApi.models import TBAMatch
+from TBApi.identity import TBAIdentityMap
+from TBApi.match_index import TBAMatchIndex, parse_match_key, build_match_key, match_played
+
+def match_json(event_key, comp_level, match_number, set_number = 1, time = None, red = ('frc1', 'frc2', 'frc3'), blue = ('frc4', 'frc5', 'frc6'), scores = (-1, -1)): #raw json for one match, in the shape TBA sends
+    return {'key': build_match_key(event_key, comp_level, match_number, None if comp_level == 'qm' else set_number),
+            'event_key': event_key, 'comp_level': comp_level, 'set_number': set_number, 'match_number': match_number,
+            'time': time, 'time_string': None, 'videos': [], 'score_breakdown': None,
+            'alliances': {'red': {'teams': list(red), 'score': scores[0]}, 'blue': {'teams': list(blue), 'score': scores[1]}}}
+
+def keys(matches):
+    return [match.key for match in matches]
+
+def test_parse_match_key():
+    assert parse_match_key('2016casj_qm12') == ('2016casj', 'qm', 1, 12)
+    assert parse_match_key('2016casj_qf2m1') == ('2016casj', 'qf', 2, 1)
+    assert parse_match_key('2016casj_f1m3') == ('2016casj', 'f', 1, 3)
+    for bad_key in ('2016casj', 'frc2403', '2016casj_xx1', '16casj_qm1'):
+        with pytest.raises(ValueError):
+            parse_match_key(bad_key)
+
+def test_build_match_key():
+    assert build_match_key('2016casj', 'qm', 12) == '2016casj_qm12'
+    assert build_match_key('2016casj', 'sf', 1, 2) == '2016casj_sf2m1'
+    assert parse_match_key(build_match_key('2016casj', 'qf', 3, 4)) == ('2016casj', 'qf', 4, 3)
+    with pytest.raises(ValueError):
+        build_match_key('2016casj', 'qf', 1)
+
+def test_add_and_lookup():
+    index = TBAMatchIndex([match_json('2016casj', 'qm', 2, time = 200), match_json('2016casj', 'qm', 1, time = 100), match_json('2016casj', 'qf', 1, 2, red = ('frc1', 'frc7', 'frc8'))])
+    assert len(index) == 3
+    assert '2016casj_qm1' in index
+    assert index.find('2016casj', 'qf', 1, 2).key == '2016casj_qf2m1'
+    assert index.find('2016casj', 'qm', 3) is None
+    assert keys(index.event_matches('2016casj')) == ['2016casj_qm1', '2016casj_qm2', '2016casj_qf2m1'] #unscheduled matches last
+    assert keys(index.team_matches('frc1', comp_levels = ('qf',))) == ['2016casj_qf2m1']
+    assert keys(index.team_eliminations('frc7')) == ['2016casj_qf2m1']
+    assert index.teams() == ['frc1', 'frc2', 'frc3', 'frc4', 'frc5', 'frc6', 'frc7', 'frc8']
+
+def test_replace():
+    index = TBAMatchIndex([match_json('2016casj', 'qm', 1, time = 100)])
+    index.add([match_json('2016casj', 'qm', 1, time = 300, red = ('frc9', 'frc2', 'frc3'))])
+    assert len(index) == 1
+    assert index.team_matches('frc1') == []
+    assert keys(index.team_matches('frc9')) == ['2016casj_qm1']
+    assert keys(index.scheduled(0, 200)) == []
+    assert keys(index.scheduled(300, 301)) == ['2016casj_qm1']
+
+def test_replace_updated_in_place_by_identity_map():
+    identity_map = TBAIdentityMap()
+    first = identity_map.intern_list(TBAMatch, [match_json('2016casj', 'qm', number, time = 100 * number) for number in range(1, 4)])
+    index = TBAMatchIndex(first)
+    second = identity_map.intern_list(TBAMatch, [match_json('2016casj', 'qm', number, time = 1000 + 100 * number, red = ('frc9', 'frc2', 'frc3')) for number in range(1, 4)])
+    assert second[0] is first[0] #the objects held by the index were updated in place
+    index.add(second)
+    assert len(index) == 3
+    assert index.team_matches('frc1') == []
+    assert keys(index.team_matches('frc9')) == ['2016casj_qm1', '2016casj_qm2', '2016casj_qm3']
+    assert index.scheduled(0, 1000) == []
+    assert keys(index.scheduled(1100, 1300)) == ['2016casj_qm1', '2016casj_qm2']
+    assert index._times == [(1100, '2016casj_qm1'), (1200, '2016casj_qm2'), (1300, '2016casj_qm3')]
+
+def test_scheduled_bounds():
+    index = TBAMatchIndex([match_json('2016casj', 'qm', number, time = 100 * number) for number in range(1, 5)] + [match_json('2016casj', 'qm', 5)])
+    assert keys(index.scheduled()) == ['2016casj_qm1', '2016casj_qm2', '2016casj_qm3', '2016casj_qm4']
+    assert keys(index.scheduled(200, 400)) == ['2016casj_qm2', '2016casj_qm3'] #start is inclusive, end is not
+    assert keys(index.scheduled(start = 350)) == ['2016casj_qm4']
+    assert keys(index.scheduled(end = 100)) == []
+
+def test_next_match():
+    index = TBAMatchIndex([match_json('2016casj', 'qm', 1, time = 100, scores = (10, 20)), match_json('2016casj', 'qm', 2, time = 200), match_json('2016casj', 'qm', 3, time = 300)])
+    assert match_played(index.get('2016casj_qm1'))
+    assert not match_played(index.get('2016casj_qm2'))
+    assert index.next_match('frc1').key == '2016casj_qm2'
+    assert index.next_match('frc1', after = 250).key == '2016casj_qm3'
+    assert index.next_match('frc1', after = 400) is None
+    assert index.next_match('frc99') is None
+    assert dict((team_key, match.key) for team_key, match in index.next_matches(['frc4', 'frc5']).items()) == {'frc4': '2016casj_qm2', 'frc5': '2016casj_qm2'}
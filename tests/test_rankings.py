@@ -0,0 +1,49 @@
+#Tests for TBAEventRankings
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from TBApi.models import TBAEventRankings
+from TBApi.export import rankings_to_array
+
+RAW = [["Rank", "Team", "Qual Avg", "Record (W-L-T)", "Played"],
+       [1, "59", 80.5, "5-0-0", 5],
+       [2, "2403", 70, "4-1-0", 5],
+       [3, "8", 70.25, "3-2-0", 5]]
+
+def teams(rows):
+    return [row.team for row in rows]
+
+def test_column_types():
+    rankings = TBAEventRankings(RAW)
+    assert rankings.column('rank').dtype.kind == 'i'
+    assert rankings.column('team').dtype.kind == 'i'
+    assert rankings.column('played').dtype.kind == 'i'
+    assert rankings.column('qual_avg').dtype.kind == 'f'
+    assert rankings.column('record').dtype.kind == 'U'
+    assert rankings_to_array(rankings)['team'].tolist() == [59, 2403, 8]
+
+def test_raw_is_untouched():
+    rankings = TBAEventRankings(RAW)
+    assert rankings.raw == RAW[1:]
+    assert rankings.raw_table is RAW
+
+def test_filter_coerces_value():
+    rankings = TBAEventRankings(RAW)
+    assert teams(rankings.filter('team', '==', '59')) == ['59']
+    assert teams(rankings.filter('team', '==', 2403)) == ['2403']
+    assert teams(rankings.filter('qual_avg', '>', '70.1')) == ['59', '8']
+    assert teams(rankings.filter('record', '==', '4-1-0')) == ['2403']
+
+def test_filter_rejects_values_of_the_wrong_type():
+    rankings = TBAEventRankings(RAW)
+    with pytest.raises(TypeError):
+        rankings.filter('record', '<', 5)
+    with pytest.raises(TypeError):
+        rankings.filter('qual_avg', '<', 'high')
+
+def test_sort_by():
+    rankings = TBAEventRankings(RAW)
+    assert teams(rankings.sort_by('qual_avg')) == ['2403', '8', '59']
+    assert teams(rankings.sort_by('team', descending = True)) == ['2403', '59', '8']
@@ -0,0 +1,76 @@
+#Tests for TBAStatsEngine
+
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from TBApi.stats import TBAStatsEngine
+
+def match_json(number, red, blue, red_score, blue_score, comp_level = 'qm', breakdown = None):
+    return {'key': '2016casj_qm' + str(number) if comp_level == 'qm' else '2016casj_' + comp_level + '1m' + str(number),
+            'event_key': '2016casj', 'comp_level': comp_level, 'set_number': 1, 'match_number': number, 'time': None, 'time_string': None, 'videos': [],
+            'score_breakdown': breakdown, 'alliances': {'red': {'teams': list(red), 'score': red_score}, 'blue': {'teams': list(blue), 'score': blue_score}}}
+
+def schedule(seed = 7, teams = 12, matches = 30): #random qualification matches with random scores
+    generator = random.Random(seed)
+    team_keys = ['frc' + str(number) for number in range(1, teams + 1)]
+    result = []
+    for number in range(1, matches + 1):
+        picked = generator.sample(team_keys, 6)
+        result.append(match_json(number, picked[:3], picked[3:], generator.randint(0, 150), generator.randint(0, 150)))
+    return result
+
+def direct_solution(matches, team_keys): #least squares on the full appearance matrix: one row per alliance, columns opr, dpr, ccwm
+    column = dict((team_key, position) for position, team_key in enumerate(team_keys))
+    rows, values = [], []
+    for match in matches:
+        alliances = match['alliances']
+        for own, opposing in (('red', 'blue'), ('blue', 'red')):
+            row = np.zeros(len(team_keys))
+            row[[column[team_key] for team_key in alliances[own]['teams']]] = 1
+            rows.append(row)
+            values.append([alliances[own]['score'], alliances[opposing]['score'], alliances[own]['score'] - alliances[opposing]['score']])
+    return np.linalg.lstsq(np.array(rows), np.array(values, dtype = float), rcond = None)[0]
+
+def test_matches_direct_least_squares():
+    matches = schedule()
+    engine = TBAStatsEngine(matches)
+    assert np.allclose(engine.solve(), direct_solution(matches, engine.teams))
+
+    stats = engine.stats()
+    position = engine.team_index['frc3']
+    assert stats.opr.raw['3'] == pytest.approx(engine.solve()[position, 0])
+    assert stats.ccwm.raw['3'] == pytest.approx(stats.opr.raw['3'] - stats.dpr.raw['3'])
+
+def test_replacing_a_match():
+    matches = schedule()
+    engine = TBAStatsEngine(matches)
+
+    changed = match_json(5, matches[4]['alliances']['red']['teams'], matches[4]['alliances']['blue']['teams'], 200, 3)
+    engine.add_matches([changed])
+    updated = matches[:4] + [changed] + matches[5:]
+    assert np.allclose(engine.solve(), direct_solution(updated, engine.teams))
+    assert np.allclose(engine.solve(), TBAStatsEngine(updated).solve())
+
+def test_unplayed_and_other_levels_are_skipped():
+    matches = schedule()
+    engine = TBAStatsEngine(matches + [match_json(99, ['frc1', 'frc2', 'frc3'], ['frc4', 'frc5', 'frc6'], -1, -1),
+                                       match_json(1, ['frc1', 'frc2', 'frc3'], ['frc4', 'frc5', 'frc6'], 300, 0, comp_level = 'qf')])
+    assert np.allclose(engine.solve(), direct_solution(matches, engine.teams))
+
+    played = dict(matches[0])
+    engine.add_matches([match_json(1, played['alliances']['red']['teams'], played['alliances']['blue']['teams'], -1, -1)]) #a played match reset to unplayed is taken back out
+    assert np.allclose(engine.solve(), direct_solution(matches[1:], engine.teams))
+
+def test_component_oprs():
+    matches = schedule()
+    for match in matches:
+        match['score_breakdown'] = {'red': {'autoPoints': match['alliances']['red']['score'] // 3}, 'blue': {'autoPoints': match['alliances']['blue']['score'] // 3}}
+    engine = TBAStatsEngine(matches)
+    assert engine.component_names() == ['autoPoints']
+
+    autos = [dict(match, alliances = {'red': dict(match['alliances']['red'], score = match['score_breakdown']['red']['autoPoints']),
+                                      'blue': dict(match['alliances']['blue'], score = match['score_breakdown']['blue']['autoPoints'])}) for match in matches]
+    expected = direct_solution(autos, engine.teams)[:, 0]
+    assert np.allclose(engine.solve()[:, engine.metric_index['autoPoints']], expected)